@@ -0,0 +1,309 @@
+# Run from the Graph (Python) directory:
+#   python -m Utils.benchmark                                            micro benchmarks of single operations
+#   python -m Utils.benchmark suite --json /tmp/results.json             scaling suite over the generated graph families
+#   python -m Utils.benchmark compare /tmp/base.json /tmp/results.json   time and memory ratios of two suite runs
+
+import argparse
+from math import isqrt
+import json
+import platform
+from random import Random
+import sys
+from time import perf_counter
+import tracemalloc
+
+from graph import Graph
+from directed_graph import DirectedGraph
+from Utils import generators
+from Utils.parallel import default_workers
+
+# The graph families of the suite by name, built for a vertex count and a seed
+FAMILIES = {
+    "erdos_renyi": lambda size, seed: generators.erdos_renyi(size, min(1.0, 8 / size), seed, storage="csr"),
+    "grid": lambda size, seed: generators.grid(isqrt(size), isqrt(size), storage="csr"),
+    "barabasi_albert": lambda size, seed: generators.barabasi_albert(size, 4, seed, storage="csr"),
+    "wheel": lambda size, seed: generators.wheel(size, storage="csr"),
+}
+# The all-pairs metrics are only measured up to this many vertices
+ALL_PAIRS_LIMIT = 2_000
+
+
+def per_call_latency(function, arguments: list, repeat: int = 5) -> float:
+    """
+    Calls the function once for every argument and returns the best average time per call in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for argument in arguments:
+            function(argument)
+        best = min(best, (perf_counter() - start) / len(arguments))
+    return best
+
+
+def vertex_lookup(sizes: tuple = (1_000, 10_000, 100_000), calls: int = 10_000) -> dict:
+    """
+    Measures the per-call latency of G.v(), G.deg() and G.remove_vertex() for growing vertex counts.\
+    Returns a dictionary mapping each size to the latencies in seconds.
+    """
+    results = {}
+    for size in sizes:
+        G = Graph(storage="csr")
+        G.add_vertices_from(size)
+        G.add_edges_from((i, i + 1) for i in range(size - 1))
+        # Spread the queried indices over the whole vertex table
+        step = max(1, size // calls)
+        indices = [(i * step) % size for i in range(calls)]
+        # The removals run on isolated vertices so only the vertex bookkeeping is measured
+        isolated = Graph(storage="csr")
+        isolated.add_vertices_from(size)
+        results[size] = {
+            "v": per_call_latency(G.v, indices),
+            "deg": per_call_latency(G.deg, indices),
+            # Every vertex can only be removed once, so the removals are measured a single time
+            "remove_vertex": per_call_latency(isolated.remove_vertex, sorted(set(indices)), repeat=1),
+        }
+    return results
+
+
+def edge_lookup(sizes: tuple = (1_000, 10_000, 100_000), calls: int = 10_000) -> dict:
+    """
+    Measures the per-call latency of G.e(v1, v2), Vertex.is_adjacent_to() and G.remove_edge() \
+    for growing edge counts (two edges per vertex, every other pair doubled by a parallel edge).\
+    Returns a dictionary mapping each size to the latencies in seconds.
+    """
+    results = {}
+    for size in sizes:
+        G = Graph(storage="csr")
+        G.add_vertices_from(size)
+        G.add_edges_from((i, (i + 1) % size) for i in range(size))
+        G.add_edges_from((i, (i + 1) % size) for i in range(0, size, 2))
+        step = max(1, size // calls)
+        pairs = [((i * step) % size, (i * step + 1) % size) for i in range(calls)]
+        vertex_pairs = [(G.v(a), G.v(b)) for a, b in pairs]
+        results[size] = {
+            "e": per_call_latency(lambda pair: G.e(*pair), pairs),
+            "is_adjacent_to": per_call_latency(lambda pair: pair[0].is_adjacent_to(pair[1]), vertex_pairs),
+            # Every edge can only be removed once, so the removals are measured a single time
+            "remove_edge": per_call_latency(G.remove_edge, [G.e(*pair)[0] for pair in set(pairs)], repeat=1),
+        }
+    return results
+
+
+def distance_matrix_scaling(size: int = 2_000, workers: tuple = None) -> dict:
+    """
+    Measures the time of G.distance_matrix on a random simple graph (about 4 edges per vertex) \
+    with 1 up to all CPU cores. Returns a dictionary mapping each worker count to the time in seconds.
+    """
+    if workers is None:
+        workers = tuple(sorted({1, 2, 4, default_workers()} & set(range(1, default_workers() + 1))))
+    # A deterministic ring with chords keeps the graph simple and connected
+    G = Graph(storage="csr")
+    G.add_vertices_from(size)
+    G.add_edges_from((i, (i + 1) % size) for i in range(size))
+    G.add_edges_from((i, (i * 7 + 3) % size) for i in range(size) if (i * 7 + 3) % size not in (i, i - 1, i + 1))
+    results = {}
+    for count in workers:
+        G.workers = count
+        start = perf_counter()
+        _ = G.distance_matrix
+        results[count] = perf_counter() - start
+    return results
+
+
+def memory_per_object(edge_count: int = 1_000_000, vertex_count: int = 250_000, graph_class=Graph) -> dict:
+    """
+    Measures the memory a CSR stored graph allocates per vertex and per edge with tracemalloc, \
+    for vertex_count vertices and edge_count random edges (the adjacency index is built once at the end).\
+    Returns a dictionary with the bytes per vertex and per edge.
+    """
+    random = Random(0)
+    pairs = [(random.randrange(vertex_count), random.randrange(vertex_count)) for _ in range(edge_count)]
+    tracemalloc.start()
+    try:
+        G = graph_class(storage="csr")
+        start = tracemalloc.get_traced_memory()[0]
+        G.add_vertices_from(vertex_count)
+        with_vertices = tracemalloc.get_traced_memory()[0]
+        G.add_edges_from(pairs)
+        G._csr_adjacency()
+        with_edges = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {"vertex": (with_vertices - start) / vertex_count, "edge": (with_edges - with_vertices) / edge_count}
+
+
+def suite(sizes: tuple = (1_000, 10_000), seed: int = 0, families: tuple = None) -> dict:
+    """
+    Runs the scaling suite: for every graph family and size, the time and the peak traced memory of \
+    construction, lookups (v, e, deg), traversal (bfs, dfs, _simple_bfs), metrics (is_connected, degree sequence \
+    and up to ALL_PAIRS_LIMIT vertices distance_matrix and diameter) and removal (edges, then vertices).\
+    The times come from a run without tracemalloc, the memory from a second run with it. \
+    Returns a JSON serializable dictionary (see compare()).
+    """
+    results = {}
+    for family in families or tuple(FAMILIES):
+        results[family] = {}
+        for size in sizes:
+            timed = _run_phases(family, size, seed, traced=False)
+            traced = _run_phases(family, size, seed, traced=True)
+            results[family][str(size)] = {phase: {"seconds": timed[phase], "peak_bytes": traced[phase]}
+                                          for phase in timed}
+    return {
+        "meta": {"python": sys.version.split()[0], "platform": platform.platform(), "seed": seed,
+                 "sizes": list(sizes)},
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict) -> list:
+    """
+    Returns (family, size, phase, base seconds, new seconds, time ratio, memory ratio) rows \
+    for every measurement present in both suite results. Ratios above 1 mean the new run is slower or bigger.
+    """
+    rows = []
+    for family, sizes in new["results"].items():
+        for size, phases in sizes.items():
+            for phase, measurement in phases.items():
+                before = base["results"].get(family, {}).get(size, {}).get(phase)
+                if before is None:
+                    continue
+                rows.append((family, size, phase, before["seconds"], measurement["seconds"],
+                             _ratio(measurement["seconds"], before["seconds"]),
+                             _ratio(measurement["peak_bytes"], before["peak_bytes"])))
+    return rows
+
+
+def _run_phases(family: str, size: int, seed: int, traced: bool) -> dict:
+    """
+    Builds the graph and runs the phases in order on it. Returns the seconds (or the peak traced bytes) by phase.
+    """
+    random = Random(seed)
+    results = {}
+    if traced:
+        tracemalloc.start()
+    try:
+        G = _measure(results, "construction", traced, lambda: FAMILIES[family](size, seed))
+        indices = [random.randrange(G.vertex_count) for _ in range(10_000)]
+        pairs = [(random.randrange(G.vertex_count), random.randrange(G.vertex_count)) for _ in range(10_000)]
+
+        def lookups():
+            for index in indices:
+                G.deg(G.v(index))
+            for v1, v2 in pairs:
+                G.e(v1, v2)
+
+        def traversal():
+            for _ in G.bfs(0):
+                pass
+            for _ in G.dfs(0):
+                pass
+            G._simple_bfs(G.v(0))
+
+        def metrics():
+            _ = G.is_connected
+            _ = G.degree_sequence
+            if size <= ALL_PAIRS_LIMIT:
+                _ = G.distance_matrix
+                _ = G.diameter
+
+        def removal():
+            edges = G.edges
+            for edge in random.sample(edges, min(1_000, len(edges))):
+                G.remove_edge(edge)
+            for index in random.sample(range(G.vertex_count), min(100, G.vertex_count)):
+                G.remove_vertex(index)
+
+        for phase, function in (("lookups", lookups), ("traversal", traversal), ("metrics", metrics),
+                                ("removal", removal)):
+            _measure(results, phase, traced, function)
+    finally:
+        if traced:
+            tracemalloc.stop()
+    return results
+
+
+def _measure(results: dict, phase: str, traced: bool, function) -> object:
+    """
+    Calls the function and stores its time (or the peak memory it traced on top of the memory already in use).
+    """
+    if traced:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        value = function()
+        results[phase] = tracemalloc.get_traced_memory()[1] - before
+    else:
+        start = perf_counter()
+        value = function()
+        results[phase] = perf_counter() - start
+    return value
+
+
+def _ratio(new: float, base: float) -> float | None:
+    """
+    Returns new / base, or None if base is 0.
+    """
+    return new / base if base else None
+
+
+def _micro() -> None:
+    """
+    Prints the tables of the micro benchmarks.
+    """
+    print(f"{'vertices':>10} {'v() [us]':>10} {'deg() [us]':>11} {'remove_vertex() [us]':>21}")
+    for size, latency in vertex_lookup().items():
+        print(f"{size:>10} {latency['v'] * 1e6:>10.3f} {latency['deg'] * 1e6:>11.3f} "
+              f"{latency['remove_vertex'] * 1e6:>21.3f}")
+    print()
+    print(f"{'vertices':>10} {'e() [us]':>10} {'is_adjacent_to() [us]':>22} {'remove_edge() [us]':>19}")
+    for size, latency in edge_lookup().items():
+        print(f"{size:>10} {latency['e'] * 1e6:>10.3f} {latency['is_adjacent_to'] * 1e6:>22.3f} "
+              f"{latency['remove_edge'] * 1e6:>19.3f}")
+    print()
+    print(f"{'workers':>10} {'distance_matrix [s]':>20} {'speedup':>8}")
+    scaling = distance_matrix_scaling()
+    for count, seconds in scaling.items():
+        print(f"{count:>10} {seconds:>20.3f} {scaling[1] / seconds:>8.2f}")
+    print()
+    print(f"{'graph':>14} {'bytes / vertex':>15} {'bytes / edge':>13}")
+    for graph_class in (Graph, DirectedGraph):
+        memory = memory_per_object(graph_class=graph_class)
+        print(f"{graph_class.__name__:>14} {memory['vertex']:>15.1f} {memory['edge']:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Graph package benchmarks.")
+    commands = parser.add_subparsers(dest="command")
+    suite_parser = commands.add_parser("suite", help="run the scaling suite")
+    suite_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    suite_parser.add_argument("--seed", type=int, default=0)
+    suite_parser.add_argument("--families", nargs="+", choices=tuple(FAMILIES))
+    suite_parser.add_argument("--json", help="write the results to this file")
+    compare_parser = commands.add_parser("compare", help="compare two suite results")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    arguments = parser.parse_args()
+
+    if arguments.command == "suite":
+        report = suite(tuple(arguments.sizes), arguments.seed, arguments.families)
+        print(f"{'family':>16} {'vertices':>9} {'phase':>13} {'seconds':>9} {'peak MiB':>9}")
+        for family, sizes in report["results"].items():
+            for size, phases in sizes.items():
+                for phase, measurement in phases.items():
+                    print(f"{family:>16} {size:>9} {phase:>13} {measurement['seconds']:>9.4f} "
+                          f"{measurement['peak_bytes'] / 2 ** 20:>9.2f}")
+        if arguments.json:
+            with open(arguments.json, "w") as file:
+                json.dump(report, file, indent=2)
+    elif arguments.command == "compare":
+        with open(arguments.base) as file:
+            base_report = json.load(file)
+        with open(arguments.new) as file:
+            new_report = json.load(file)
+        print(f"{'family':>16} {'vertices':>9} {'phase':>13} {'base [s]':>9} {'new [s]':>9} {'time':>6} {'memory':>7}")
+        for family, size, phase, before, after, time_ratio, memory_ratio in compare(base_report, new_report):
+            print(f"{family:>16} {size:>9} {phase:>13} {before:>9.4f} {after:>9.4f} "
+                  f"{'-' if time_ratio is None else f'{time_ratio:.2f}':>6} "
+                  f"{'-' if memory_ratio is None else f'{memory_ratio:.2f}':>7}")
+    else:
+        _micro()
@@ -0,0 +1,301 @@
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+# File layout (all sections start at a multiple of 8 bytes):
+# header        magic, format version, flags, vertex slots, vertex count, edge count,
+#               outgoing entry count and incoming entry count (0 for undirected graphs)
+# vertex table  one byte per vertex slot, 1 for present and 0 for removed vertices
+# adjacency     CSR offsets (slots + 1), self-loop entry counts (slots), neighbors and weights (entries each)
+# in adjacency  the same four arrays for the incoming edges of directed graphs
+MAGIC = b"GRPH"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQQQQ")
+# Flag bits
+_DIRECTED = 1
+_FLOAT_WEIGHTS = 2
+_BIG_ENDIAN = 4
+
+
+def save(path: str, slots: int, removed: set, edge_count: int, csr: object, in_csr: object = None) -> None:
+    """
+    Writes the graph to the file at path. csr is the (outgoing) CSRAdjacency, in_csr the incoming one \
+    of directed graphs. Vertex values are not saved.
+    """
+    weights = [csr.weights] if in_csr is None else [csr.weights, in_csr.weights]
+    flags = 0
+    if in_csr is not None:
+        flags |= _DIRECTED
+    if any(w.typecode == "d" for w in weights):
+        flags |= _FLOAT_WEIGHTS
+    if sys.byteorder == "big":
+        flags |= _BIG_ENDIAN
+    table = bytearray(b"\x01") * slots
+    for index in removed:
+        table[index] = 0
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, slots, slots - len(removed), edge_count,
+                                csr.entry_count, 0 if in_csr is None else in_csr.entry_count))
+        _write_aligned(file, bytes(table))
+        for adjacency in (csr, in_csr):
+            if adjacency is None:
+                continue
+            loops = array("q", (adjacency.degree(row) - adjacency.degree(row, False) for row in range(slots)))
+            file.write(adjacency.offsets.tobytes())
+            file.write(loops.tobytes())
+            file.write(adjacency.neighbors.tobytes())
+            typecode = "d" if flags & _FLOAT_WEIGHTS else "q"
+            file.write(array(typecode, adjacency.weights).tobytes())
+
+
+def _write_aligned(file, data: bytes) -> None:
+    """
+    Writes the data followed by zeros up to the next multiple of 8 bytes.
+    """
+    file.write(data)
+    file.write(bytes(-len(data) % 8))
+
+
+class MappedGraph:
+    """
+    Read-only view of a saved graph that serves degree and neighbor queries straight from the memory mapped file \
+    without creating vertex or edge objects. Close it (or use it in a with block) to unmap the file.
+    """
+
+    # Dunder methods
+
+    def __init__(self, path: str, use_mmap: bool = True) -> None:
+
+        # The typed views of the sections, the first one spans the whole file. They are released by self.close()
+        self._views: list = []
+        # The open file and its mapping (or its contents read into memory)
+        self._buffer = b""
+        self._file = open(path, "rb")
+        try:
+            if use_mmap and os.fstat(self._file.fileno()).st_size:
+                self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._buffer = self._file.read()
+        except BaseException:
+            self._file.close()
+            raise
+        view = memoryview(self._buffer)
+        self._views.append(view)
+        if len(view) < _HEADER.size:
+            self._invalid("The file is not a saved graph.")
+        magic, version, flags, slots, vertex_count, edge_count, entries, in_entries = \
+            _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            self._invalid("The file is not a saved graph.")
+        if version != FORMAT_VERSION:
+            self._invalid(f"Unsupported graph file format version {version}.")
+        if bool(flags & _BIG_ENDIAN) != (sys.byteorder == "big"):
+            self._invalid("The graph file was saved on a machine with a different byte order.")
+        position = _HEADER.size + slots + (-slots % 8)
+        for count in (entries, in_entries) if flags & _DIRECTED else (entries,):
+            position += 8 * (2 * slots + 1 + 2 * count)
+        if len(view) < position:
+            self._invalid("The graph file is truncated.")
+
+        # Header fields
+        self._directed: bool = bool(flags & _DIRECTED)
+        self._slots: int = slots
+        self._vertex_count: int = vertex_count
+        self._edge_count: int = edge_count
+        position = _HEADER.size
+        self._table: memoryview = self._section(position, slots, "B")
+        position += slots + (-slots % 8)
+        weight_typecode = "d" if flags & _FLOAT_WEIGHTS else "q"
+        self._adjacency: tuple = ()
+        self._in_adjacency: tuple = ()
+        for count in (entries, in_entries) if self._directed else (entries,):
+            arrays = []
+            for length, typecode in ((slots + 1, "q"), (slots, "q"), (count, "q"), (count, weight_typecode)):
+                arrays.append(self._section(position, length, typecode))
+                position += 8 * length
+            if not self._adjacency:
+                self._adjacency = tuple(arrays)
+            else:
+                self._in_adjacency = tuple(arrays)
+
+    def __enter__(self) -> "MappedGraph":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._vertex_count
+
+    # Properties
+
+    @property
+    def directed(self) -> bool:
+        """
+        Whether the saved graph is directed.
+        """
+        return self._directed
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        Returns the number of vertices (removed vertices excluded).
+        """
+        return self._vertex_count
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Returns the number of edges.
+        """
+        return self._edge_count
+
+    @property
+    def slots(self) -> int:
+        """
+        Returns the number of vertex indices, the removed ones included (the highest vertex index + 1).
+        """
+        return self._slots
+
+    @property
+    def vertices(self) -> list:
+        """
+        Returns the indices of the present vertices.
+        """
+        table = self._table
+        return [index for index in range(self._slots) if table[index]]
+
+    @property
+    def csr(self) -> tuple:
+        """
+        Returns the (offsets, neighbors, weights) views of the (outgoing) adjacency.
+        """
+        offsets, _, neighbors, weights = self._adjacency
+        return offsets, neighbors, weights
+
+    @property
+    def in_csr(self) -> tuple:
+        """
+        Returns the (offsets, neighbors, weights) views of the incoming adjacency, the outgoing one if undirected.
+        """
+        offsets, _, neighbors, weights = self._in_adjacency or self._adjacency
+        return offsets, neighbors, weights
+
+    # Instance methods
+
+    def has_vertex(self, index: int) -> bool:
+        """
+        Whether a vertex with the given index is present.
+        """
+        return 0 <= index < self._slots and bool(self._table[index])
+
+    def deg(self, index: int, count_self_loop: bool = True) -> int:
+        """
+        Returns the degree of the vertex, the sum of the out and in degree in directed graphs.
+        """
+        deg = self._degree(self._adjacency, index, count_self_loop)
+        if self._directed:
+            deg += self._degree(self._in_adjacency, index, count_self_loop)
+        return deg
+
+    def out_deg(self, index: int, count_self_loop: bool = True) -> int:
+        """
+        Returns the number of edges leaving the vertex (its degree in undirected graphs).
+        """
+        return self._degree(self._adjacency, index, count_self_loop)
+
+    def in_deg(self, index: int, count_self_loop: bool = True) -> int:
+        """
+        Returns the number of edges entering the vertex (its degree in undirected graphs).
+        """
+        return self._degree(self._in_adjacency or self._adjacency, index, count_self_loop)
+
+    def neighbors(self, index: int) -> memoryview:
+        """
+        Returns the indices of the vertices the edges of the vertex lead to, as a view into the file.
+        """
+        offsets, _, neighbors, _ = self._adjacency
+        self._check(index)
+        return neighbors[offsets[index]:offsets[index + 1]]
+
+    def weights(self, index: int) -> memoryview:
+        """
+        Returns the weights of the edges in self.neighbors(index), as a view into the file.
+        """
+        offsets, _, _, weights = self._adjacency
+        self._check(index)
+        return weights[offsets[index]:offsets[index + 1]]
+
+    def in_neighbors(self, index: int) -> memoryview:
+        """
+        Returns the indices of the vertices the edges entering the vertex come from, as a view into the file.
+        """
+        offsets, _, neighbors, _ = self._in_adjacency or self._adjacency
+        self._check(index)
+        return neighbors[offsets[index]:offsets[index + 1]]
+
+    def edges(self):
+        """
+        Yields every edge once as (v1, v2, weight), ordered by v1 (the vertex the edge leaves in directed graphs).
+        """
+        offsets, _, neighbors, weights = self._adjacency
+        for row in range(self._slots):
+            loop_entry = False
+            for i in range(offsets[row], offsets[row + 1]):
+                other = neighbors[i]
+                if self._directed or other > row:
+                    yield row, other, weights[i]
+                elif other == row:
+                    # An undirected self-loop has two entries in its row
+                    if not loop_entry:
+                        yield row, other, weights[i]
+                    loop_entry = not loop_entry
+
+    def close(self) -> None:
+        """
+        Releases the views and unmaps and closes the file. The graph must not be used afterward \
+        and the views returned by its methods must be released first.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def _invalid(self, message: str) -> None:
+        """
+        Closes the file and raises a ValueError with the given message.
+        """
+        self.close()
+        raise ValueError(message)
+
+    def _section(self, position: int, length: int, typecode: str) -> memoryview:
+        """
+        Returns a typed view of length items starting at the byte position.
+        """
+        size = array(typecode).itemsize
+        raw = self._views[0][position:position + length * size]
+        view = raw.cast(typecode)
+        self._views.extend((raw, view))
+        return view
+
+    def _check(self, index: int) -> None:
+        """
+        Raises a KeyError if no vertex with the given index is present.
+        """
+        if not self.has_vertex(index):
+            raise KeyError("The given vertex index does not exist.")
+
+    def _degree(self, adjacency: tuple, index: int, count_self_loop: bool) -> int:
+        """
+        Returns the number of entries of the vertex in the given adjacency.
+        """
+        offsets, loops, _, _ = adjacency
+        self._check(index)
+        deg = offsets[index + 1] - offsets[index]
+        if not count_self_loop:
+            deg -= loops[index]
+        return deg
@@ -0,0 +1,89 @@
+from array import array
+
+from Utils.instrumentation import count_searches
+
+# Multi-source breadth first search. Every vertex carries one integer whose bits are the sources
+# whose search has reached it, so one pass over an edge advances the searches of up to width sources.
+# Python integers have no fixed word size, so the batches can be wider than 64 bits.
+
+# The number of sources per batch of distance_rows(). Every source keeps a full row while its batch runs
+DISTANCE_WIDTH = 256
+
+
+def distance_rows(offsets: array, neighbors: array, sources: list, width: int = DISTANCE_WIDTH) -> dict:
+    """
+    Returns the unweighted distances from every source as a dictionary mapping the source to its row.\
+    Unreachable vertices have a distance of 0.
+    """
+    count_searches(len(sources))
+    size = len(offsets) - 1
+    rows = {}
+    for batch in _batches(sources, width):
+        batch_rows = [[0] * size for _ in batch]
+        for level, frontier in _levels(offsets, neighbors, batch):
+            for vertex, bits in frontier.items():
+                while bits:
+                    low = bits & -bits
+                    batch_rows[low.bit_length() - 1][vertex] = level
+                    bits ^= low
+        rows.update(zip(batch, batch_rows))
+    return rows
+
+
+def eccentricities(offsets: array, neighbors: array, sources: list, width: int = 1024) -> list:
+    """
+    Returns the eccentricity of every source (the longest distance to a reachable vertex) in the order of sources.
+    """
+    count_searches(len(sources))
+    result = []
+    for batch in _batches(sources, width):
+        eccentricity = [0] * len(batch)
+        for level, frontier in _levels(offsets, neighbors, batch):
+            # The sources that still reach new vertices on this level
+            bits = 0
+            for new in frontier.values():
+                bits |= new
+            while bits:
+                low = bits & -bits
+                eccentricity[low.bit_length() - 1] = level
+                bits ^= low
+        result.extend(eccentricity)
+    return result
+
+
+def _batches(sources: list, width: int):
+    """
+    Splits the sources into batches of at most width sources.
+    """
+    for i in range(0, len(sources), width):
+        yield sources[i:i + width]
+
+
+def _levels(offsets: array, neighbors: array, batch: list):
+    """
+    Advances the breadth first searches of all sources in the batch at once and yields \
+    (level, frontier) for every level. The frontier maps each newly reached vertex to a bitset \
+    with bit k set if the vertex was reached from batch[k] on this level.
+    """
+    visited = [0] * (len(offsets) - 1)
+    frontier = {}
+    for k, source in enumerate(batch):
+        visited[source] |= 1 << k
+        frontier[source] = frontier.get(source, 0) | 1 << k
+    level = 0
+    while frontier:
+        level += 1
+        # Every vertex passes the bits of its frontier on to all of its neighbors
+        pushed = {}
+        for vertex, bits in frontier.items():
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = neighbors[i]
+                pushed[neighbor] = pushed.get(neighbor, 0) | bits
+        frontier = {}
+        for vertex, bits in pushed.items():
+            new = bits & ~visited[vertex]
+            if new:
+                visited[vertex] |= new
+                frontier[vertex] = new
+        if frontier:
+            yield level, frontier
@@ -0,0 +1,83 @@
+from functools import wraps
+
+
+class VersionedCache:
+    """
+    Memoizes computed values together with the graph version they were computed for.\
+    A value is served from the cache for as long as the graph version stays the same.
+    """
+
+    # Dunder methods
+
+    def __init__(self) -> None:
+
+        # The cached values by key, all computed for self._entry_version
+        self._entries: dict = {}
+        # The version of the cached values. Older values are dropped as soon as a newer version is requested
+        self._entry_version: int | None = None
+        # The number of hits and misses by key name
+        self._hits: dict = {}
+        self._misses: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Properties
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns the total and per-name hit and miss counts along with the number of cached values.
+        """
+        names = sorted(set(self._hits) | set(self._misses))
+        return {
+            "hits": sum(self._hits.values()),
+            "misses": sum(self._misses.values()),
+            "size": len(self._entries),
+            "by_name": {name: {"hits": self._hits.get(name, 0), "misses": self._misses.get(name, 0)}
+                        for name in names},
+        }
+
+    # Instance methods
+
+    def get(self, key: tuple, version: int, compute) -> object:
+        """
+        Returns the cached value of the key if it was computed for the given version. \
+        Otherwise calls compute(), caches and returns its result.\
+        The first element of the key is its name in the stats.
+        """
+        if version != self._entry_version:
+            self._entries.clear()
+            self._entry_version = version
+        name = key[0]
+        if key in self._entries:
+            self._hits[name] = self._hits.get(name, 0) + 1
+            return self._entries[key]
+        self._misses[name] = self._misses.get(name, 0) + 1
+        value = compute()
+        self._entries[key] = value
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops all cached values and resets the stats.
+        """
+        self._entries.clear()
+        self._entry_version = None
+        self._hits.clear()
+        self._misses.clear()
+
+
+def versioned(function):
+    """
+    Decorator for graph methods (and properties) whose result only depends on the graph's structure.\
+    The result is cached in the graph's self._cache for the current self._version. \
+    The positional arguments become part of the cache key and must be hashable.
+    """
+    name = function.__name__
+
+    @wraps(function)
+    def wrapper(self, *args):
+        return self._cache.get((name,) + args, self._version, lambda: function(self, *args))
+
+    return wrapper
@@ -0,0 +1,234 @@
+from array import array
+from random import Random
+
+from Utils import parallel, shortest_paths
+
+# PageRank and eigenvector centrality by power iteration over the compressed sparse row adjacency.
+# Every iteration is one pass over the flat entry arrays: with NumPy it is a gather and a np.bincount scatter,
+# without it a loop over array("d") buffers. Both compute the same values.
+# Betweenness sums the shortest path dependencies of Brandes' algorithm, optionally in a process pool.
+# The scores are returned as lists by vertex index, removed vertex indices (empty rows) score 0.
+
+# Set to False to use the array fallback even if NumPy is installed
+USE_NUMPY = True
+
+
+def pagerank(offsets: array, neighbors: array, weights: array, vertices: list, alpha: float = 0.85,
+             weighted: bool = True, tolerance: float = 1e-6, max_iterations: int = 100, start: list = None,
+             double_loops: bool = False) -> list:
+    """
+    Returns the PageRank of every vertex index: the stationary distribution of a walk that follows an edge \
+    of the current vertex (chosen by weight) with probability alpha and jumps to a random vertex otherwise. \
+    Vertices without edges to follow (dangling ones) jump to a random vertex.\
+    start is a previous result (or any non-negative list by vertex index) to warm start from. \
+    The iteration stops once the scores change by less than tolerance per vertex (summed absolute change).\
+    double_loops=True halves the entries of self-loops, which undirected adjacencies list twice.\
+    Raises a ValueError for negative weights or if the scores do not converge within max_iterations.
+    """
+    count = len(vertices)
+    if not count:
+        return [0.0] * (len(offsets) - 1)
+    numpy = _numpy()
+    if numpy is not None:
+        sources, targets, values = _numpy_entries(numpy, offsets, neighbors, weights, weighted, double_loops)
+        size = len(offsets) - 1
+        if values.size and values.min() < 0:
+            raise ValueError("PageRank requires non-negative edge weights.")
+        present = numpy.zeros(size, dtype=bool)
+        present[vertices] = True
+        out_weight = numpy.bincount(sources, weights=values, minlength=size)
+        dangling = present & (out_weight == 0)
+        # The share of a vertex's score that every entry of its row passes on
+        shares = values / numpy.where(out_weight == 0, 1, out_weight)[sources]
+        scores = _numpy_start(numpy, start, present, size, count, 1)
+        for _ in range(max_iterations):
+            following = alpha * numpy.bincount(targets, weights=scores[sources] * shares, minlength=size)
+            following[present] += (1 - alpha + alpha * scores[dangling].sum()) / count
+            if numpy.abs(following - scores).sum() < count * tolerance:
+                return following.tolist()
+            scores = following
+    else:
+        size = len(offsets) - 1
+        values = _entry_values(offsets, neighbors, weights, weighted, double_loops)
+        if values and min(values) < 0:
+            raise ValueError("PageRank requires non-negative edge weights.")
+        out_weight = array("d", bytes(8 * size))
+        for row in range(size):
+            for i in range(offsets[row], offsets[row + 1]):
+                out_weight[row] += values[i]
+        dangling = [index for index in vertices if out_weight[index] == 0]
+        shares = array("d", values)
+        for row in range(size):
+            if out_weight[row]:
+                for i in range(offsets[row], offsets[row + 1]):
+                    shares[i] /= out_weight[row]
+        scores = _array_start(start, vertices, size, 1)
+        for _ in range(max_iterations):
+            following = array("d", bytes(8 * size))
+            for row in range(size):
+                score = alpha * scores[row]
+                if score:
+                    for i in range(offsets[row], offsets[row + 1]):
+                        following[neighbors[i]] += score * shares[i]
+            jump = (1 - alpha + alpha * sum(scores[index] for index in dangling)) / count
+            for index in vertices:
+                following[index] += jump
+            if sum(abs(new - old) for new, old in zip(following, scores)) < count * tolerance:
+                return following.tolist()
+            scores = following
+    raise ValueError(f"PageRank did not converge within {max_iterations} iterations.")
+
+
+def eigenvector_centrality(offsets: array, neighbors: array, weights: array, vertices: list, weighted: bool = True,
+                           tolerance: float = 1e-6, max_iterations: int = 100, start: list = None,
+                           double_loops: bool = False) -> list:
+    """
+    Returns the eigenvector centrality of every vertex index: the principal eigenvector of the adjacency, \
+    where every vertex scores the (weighted) sum of the scores of the vertices whose rows list it, \
+    normalized to a Euclidean length of 1. The iteration multiplies with the adjacency plus the identity, \
+    which has the same eigenvectors and also converges on bipartite graphs.\
+    start, tolerance and double_loops are as in pagerank(). \
+    Raises a ValueError if the scores do not converge within max_iterations.
+    """
+    count = len(vertices)
+    if not count:
+        return [0.0] * (len(offsets) - 1)
+    numpy = _numpy()
+    if numpy is not None:
+        sources, targets, values = _numpy_entries(numpy, offsets, neighbors, weights, weighted, double_loops)
+        size = len(offsets) - 1
+        present = numpy.zeros(size, dtype=bool)
+        present[vertices] = True
+        scores = _numpy_start(numpy, start, present, size, count, 2)
+        for _ in range(max_iterations):
+            following = scores + numpy.bincount(targets, weights=scores[sources] * values, minlength=size)
+            length = numpy.sqrt((following * following).sum())
+            if length:
+                following /= length
+            if numpy.abs(following - scores).sum() < count * tolerance:
+                return following.tolist()
+            scores = following
+    else:
+        size = len(offsets) - 1
+        values = _entry_values(offsets, neighbors, weights, weighted, double_loops)
+        scores = _array_start(start, vertices, size, 2)
+        for _ in range(max_iterations):
+            following = array("d", scores)
+            for row in range(size):
+                score = scores[row]
+                if score:
+                    for i in range(offsets[row], offsets[row + 1]):
+                        following[neighbors[i]] += score * values[i]
+            length = sum(score * score for score in following) ** 0.5
+            if length:
+                for index in vertices:
+                    following[index] /= length
+            if sum(abs(new - old) for new, old in zip(following, scores)) < count * tolerance:
+                return following.tolist()
+            scores = following
+    raise ValueError(f"The eigenvector centrality did not converge within {max_iterations} iterations.")
+
+
+def betweenness(offsets: array, neighbors: array, weights: array, vertices: list, directed: bool,
+                unit: bool = False, normalized: bool = True, samples: int = None, seed: int = None,
+                workers: int = 1) -> list:
+    """
+    Returns the betweenness centrality of every vertex index with Brandes' algorithm: the number of \
+    shortest paths between other vertices that pass through it, each divided by the number of shortest paths \
+    between its endpoints (see shortest_paths.dependencies()). unit=True uses breadth first searches.\
+    samples=k runs the searches from k sources picked at random (seeded) and scales the sums by n / k, \
+    an unbiased estimate for graphs too large for a search from every vertex. The searches are split \
+    between workers processes. normalized divides by the number of pairs of other vertices.
+    """
+    sources = list(vertices)
+    if samples is not None and samples < len(sources):
+        sources = Random(seed).sample(sources, samples)
+    if workers > 1 and len(sources) > 1:
+        result = parallel.betweenness_dependencies(offsets, neighbors, weights, sources, unit, workers)
+    else:
+        result = shortest_paths.dependencies(offsets, neighbors, weights, sources, unit)
+    count = len(vertices)
+    # Undirected graphs count every pair from both ends
+    scale = (count / len(sources) if sources else 1) * (1 if directed else 0.5)
+    if normalized and count > 2:
+        scale /= (count - 1) * (count - 2) * (1 if directed else 0.5)
+    return [score * scale for score in result]
+
+
+def _numpy():
+    """
+    Returns the numpy module, None if it is missing or disabled by USE_NUMPY.
+    """
+    if not USE_NUMPY:
+        return None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _numpy_entries(numpy, offsets: array, neighbors: array, weights: array, weighted: bool,
+                   double_loops: bool) -> tuple:
+    """
+    Returns the (source rows, target indices, float values) NumPy arrays of the adjacency entries.
+    """
+    offsets = numpy.frombuffer(offsets, dtype=numpy.int64)
+    targets = numpy.frombuffer(neighbors, dtype=numpy.int64)
+    sources = numpy.repeat(numpy.arange(len(offsets) - 1), numpy.diff(offsets))
+    if weighted:
+        values = numpy.frombuffer(weights, dtype=numpy.int64 if weights.typecode == "q" else numpy.float64)
+        values = values.astype(numpy.float64)
+    else:
+        values = numpy.ones(len(targets))
+    if double_loops:
+        values = numpy.where(sources == targets, values / 2, values)
+    return sources, targets, values
+
+
+def _numpy_start(numpy, start: list, present, size: int, count: int, order: int):
+    """
+    Returns the starting scores as a NumPy array, the given ones or uniform ones on the present indices, \
+    normalized to a sum (order 1) or Euclidean length (order 2) of 1.
+    """
+    if start is None:
+        scores = numpy.where(present, 1.0, 0.0)
+    else:
+        scores = numpy.where(present, numpy.asarray(start, dtype=numpy.float64), 0.0)
+        if scores.min() < 0:
+            raise ValueError("The start scores must not be negative.")
+    norm = scores.sum() if order == 1 else numpy.sqrt((scores * scores).sum())
+    if not norm:
+        raise ValueError("The start scores must not all be 0.")
+    return scores / norm
+
+
+def _entry_values(offsets: array, neighbors: array, weights: array, weighted: bool, double_loops: bool) -> array:
+    """
+    Returns the float value of every adjacency entry: its weight (1 if not weighted), halved for self-loops \
+    if double_loops.
+    """
+    values = array("d", weights) if weighted else array("d", [1.0]) * len(neighbors)
+    if double_loops:
+        for row in range(len(offsets) - 1):
+            for i in range(offsets[row], offsets[row + 1]):
+                if neighbors[i] == row:
+                    values[i] /= 2
+    return values
+
+
+def _array_start(start: list, vertices: list, size: int, order: int) -> array:
+    """
+    Returns the starting scores as an array("d") (see _numpy_start()).
+    """
+    scores = array("d", bytes(8 * size))
+    for index in vertices:
+        scores[index] = 1.0 if start is None else start[index]
+    if min(scores, default=0) < 0:
+        raise ValueError("The start scores must not be negative.")
+    norm = sum(scores) if order == 1 else sum(score * score for score in scores) ** 0.5
+    if not norm:
+        raise ValueError("The start scores must not all be 0.")
+    for index in vertices:
+        scores[index] /= norm
+    return scores
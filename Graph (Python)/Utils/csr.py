@@ -0,0 +1,136 @@
+from array import array
+
+
+class CSRAdjacency:
+    """
+    Compressed sparse row (CSR) representation of a graph's adjacency.\
+    Row i holds the neighbors of the vertex with the index i in neighbors[offsets[i]:offsets[i + 1]], \
+    the weights of the connecting edges at the same positions in weights and the edge objects in edges.
+    """
+
+    # Dunder methods
+
+    def __init__(self, offsets: array, neighbors: array, weights: array, edges: list, loops: array) -> None:
+
+        # The start of every row in the neighbor array. Has one more entry than there are rows
+        self._offsets: array = offsets
+        # The neighbor indices of all rows, one after another
+        self._neighbors: array = neighbors
+        # The weight of the edge to each neighbor
+        self._weights: array = weights
+        # The edge object to each neighbor
+        self._edges: list = edges
+        # The number of entries in each row that point back to the row itself (self-loops)
+        self._loops: array = loops
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows.
+        """
+        return len(self._offsets) - 1
+
+    # Properties
+
+    @property
+    def offsets(self) -> array:
+        """
+        Returns the row offset array.
+        """
+        return self._offsets
+
+    @property
+    def neighbors(self) -> array:
+        """
+        Returns the flat neighbor array.
+        """
+        return self._neighbors
+
+    @property
+    def weights(self) -> array:
+        """
+        Returns the flat weight array.
+        """
+        return self._weights
+
+    @property
+    def entry_count(self) -> int:
+        """
+        Returns the number of stored entries.
+        """
+        return len(self._neighbors)
+
+    # Instance methods
+
+    def degree(self, row: int, count_self_loop: bool = True) -> int:
+        """
+        Returns the number of entries in the given row.
+        """
+        if row >= len(self._loops):
+            return 0
+        deg = self._offsets[row + 1] - self._offsets[row]
+        if not count_self_loop:
+            deg -= self._loops[row]
+        return deg
+
+    def row(self, row: int) -> array:
+        """
+        Returns the neighbor indices of the given row.
+        """
+        if row >= len(self._loops):
+            return self._neighbors[0:0]
+        return self._neighbors[self._offsets[row]:self._offsets[row + 1]]
+
+    def row_weights(self, row: int) -> array:
+        """
+        Returns the weights of the given row.
+        """
+        if row >= len(self._loops):
+            return self._weights[0:0]
+        return self._weights[self._offsets[row]:self._offsets[row + 1]]
+
+    def row_edges(self, row: int) -> list:
+        """
+        Returns the edge objects of the given row.
+        """
+        if row >= len(self._loops):
+            return []
+        return self._edges[self._offsets[row]:self._offsets[row + 1]]
+
+    # Class methods
+
+    @classmethod
+    def from_entries(cls, row_count: int, entries) -> "CSRAdjacency":
+        """
+        Builds the CSR arrays from an iterable of (row, neighbor, weight, edge) entries.\
+        Entries of the same row keep the order in which they are given.
+        """
+        rows = array("q")
+        columns = array("q")
+        weight_list = []
+        edge_list = []
+        for row, neighbor, weight, edge in entries:
+            rows.append(row)
+            columns.append(neighbor)
+            weight_list.append(weight)
+            edge_list.append(edge)
+        # Counting sort of the entries by row
+        offsets = array("q", bytes(8 * (row_count + 1)))
+        loops = array("q", bytes(8 * row_count))
+        for i, row in enumerate(rows):
+            offsets[row + 1] += 1
+            if columns[i] == row:
+                loops[row] += 1
+        for i in range(row_count):
+            offsets[i + 1] += offsets[i]
+        typecode = "q" if all(isinstance(w, int) for w in weight_list) else "d"
+        neighbors = array("q", bytes(8 * len(rows)))
+        weights = array(typecode, bytes(8 * len(rows)))
+        edges = [None] * len(rows)
+        position = offsets[:-1]
+        for i, row in enumerate(rows):
+            p = position[row]
+            neighbors[p] = columns[i]
+            weights[p] = weight_list[i]
+            edges[p] = edge_list[i]
+            position[row] = p + 1
+        return cls(offsets, neighbors, weights, edges, loops)
@@ -0,0 +1,94 @@
+from array import array
+from collections import deque
+
+from Utils.traversal import bfs_indices
+
+
+def strongly_connected_components(offsets: array, neighbors: array, vertices: list) -> list:
+    """
+    Returns the strongly connected components of the outgoing compressed sparse row adjacency \
+    as lists of vertex indices, found by an iterative Tarjan search from every vertex.\
+    The components come out in reverse topological order (a component only has edges to the ones before it).
+    """
+    size = len(offsets) - 1
+    discovery = [-1] * size
+    low = [0] * size
+    on_stack = bytearray(size)
+    stack = []
+    components = []
+    counter = 0
+    for root in vertices:
+        if discovery[root] != -1:
+            continue
+        discovery[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # Every work entry is a vertex on the search path with the position of its next neighbor
+        work = [(root, offsets[root])]
+        while work:
+            current, position = work[-1]
+            end = offsets[current + 1]
+            while position < end:
+                other = neighbors[position]
+                position += 1
+                if discovery[other] == -1:
+                    work[-1] = (current, position)
+                    discovery[other] = low[other] = counter
+                    counter += 1
+                    stack.append(other)
+                    on_stack[other] = 1
+                    work.append((other, offsets[other]))
+                    break
+                if on_stack[other] and discovery[other] < low[current]:
+                    low[current] = discovery[other]
+            else:
+                # Every neighbor is done, hand the low link back to the parent
+                work.pop()
+                if work and low[current] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[current]
+                if low[current] == discovery[current]:
+                    component = []
+                    while True:
+                        other = stack.pop()
+                        on_stack[other] = 0
+                        component.append(other)
+                        if other == current:
+                            break
+                    components.append(component)
+    return components
+
+
+def topological_order(offsets: array, neighbors: array, vertices: list) -> list:
+    """
+    Returns the vertex indices in topological order (every edge leaves an earlier vertex) using Kahn's algorithm.\
+    Vertices on or behind a cycle are never freed, so the order is shorter than vertices if the graph has a cycle.
+    """
+    in_degree = [0] * (len(offsets) - 1)
+    for other in neighbors:
+        in_degree[other] += 1
+    queue = deque(vertex for vertex in vertices if in_degree[vertex] == 0)
+    order = []
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            in_degree[other] -= 1
+            if in_degree[other] == 0:
+                queue.append(other)
+    return order
+
+
+def reachable(offsets: array, neighbors: array, source: int, target: int) -> bool:
+    """
+    Returns True if there is a path from the source to the target. The search stops as soon as it finds the target.
+    """
+    return any(index == target for index, _, _ in bfs_indices(offsets, neighbors, source))
+
+
+def reached(offsets: array, neighbors: array, source: int) -> list:
+    """
+    Returns the indices of all vertices reachable from the source, the source excluded.
+    """
+    return [index for index, _, depth in bfs_indices(offsets, neighbors, source) if depth]
@@ -0,0 +1,198 @@
+from array import array
+
+from Utils import bitset_bfs
+from Utils.instrumentation import count_searches
+
+# Diameter, radius and center of undirected graphs from a few breadth first searches instead of one per vertex.
+# The graph is given as its compressed sparse row adjacency and its connected components as lists of vertex indices.
+# The eccentricity of a vertex only counts the vertices it reaches, so every component is solved on its own.
+# The exact values use the bounding eccentricities algorithm (Takes and Kosters): every search from a vertex v
+# tightens the bounds of every vertex w it reaches to max(d(v, w), e(v) - d(v, w)) <= e(w) <= e(v) + d(v, w),
+# until the bounds decide which vertices can still change the result. Once the single searches stop paying off,
+# the eccentricities of the remaining candidates are computed together by the multi-source search of Utils.bitset_bfs.
+
+# The number of single searches that tighten the bounds before the remaining candidates are batched
+SINGLE_SEARCHES = 32
+# The number of candidate sources whose eccentricities are computed in one multi-source pass
+BATCH_SIZE = 1024
+
+
+def diameter(offsets: array, neighbors: array, components: list) -> int:
+    """
+    Returns the exact diameter, the highest diameter of the components. \
+    Components with fewer vertices than the diameter found so far are skipped.
+    """
+    distance, _ = _buffers(offsets)
+    best = 0
+    for component in sorted(components, key=len, reverse=True):
+        if len(component) - 1 <= best:
+            break
+        # A vertex can only raise the diameter if its upper bound is above the longest eccentricity found
+        lower, _ = _bounding_eccentricities(offsets, neighbors, component, distance,
+                                            lambda lower, upper, found: upper > max(found, best))
+        best = max(best, max(lower.values()))
+    return best
+
+
+def radius_and_center(offsets: array, neighbors: array, components: list) -> tuple:
+    """
+    Returns the exact radius, the lowest radius of the components, and the sorted indices of the central vertices, \
+    the centers of the components with that radius.
+    """
+    if not components:
+        return 0, []
+    isolated = [component[0] for component in components if len(component) == 1]
+    if isolated:
+        # An isolated vertex has the eccentricity 0, every other vertex at least 1
+        return 0, sorted(isolated)
+    distance, _ = _buffers(offsets)
+    radius, center = None, []
+    for component in components:
+        # A vertex can only be central if its lower bound is not above the shortest eccentricity found
+        _, upper = _bounding_eccentricities(offsets, neighbors, component, distance,
+                                            lambda lower, upper, found: lower <= found, smallest=True)
+        component_radius = min(upper.values())
+        component_center = [vertex for vertex in component if upper[vertex] == component_radius]
+        if radius is None or component_radius < radius:
+            radius, center = component_radius, component_center
+        elif component_radius == radius:
+            center.extend(component_center)
+    return radius, sorted(center)
+
+
+def bounds(offsets: array, neighbors: array, components: list, sweeps: int) -> tuple:
+    """
+    Returns ((diameter lower, diameter upper), (radius lower, radius upper)) after the given number of \
+    double sweeps per component, two linear time searches each.\
+    Every search from v gives e(v) <= diameter <= 2 e(v) and radius <= e(v), and the radius is at least \
+    half of the diameter. The next sweep starts from the middle of the previous sweep's path.
+    """
+    if not components:
+        return (0, 0), (0, 0)
+    distance, parent = _buffers(offsets)
+    diameter_lower = diameter_upper = 0
+    radius_lower = radius_upper = None
+    for component in components:
+        if len(component) == 1:
+            radius_lower = radius_upper = 0
+            continue
+        component_lower, component_upper = 0, len(component)
+        eccentricity_lower = len(component)
+        source = max(component, key=lambda vertex: _degree(offsets, vertex))
+        for _ in range(sweeps):
+            for second in (False, True):
+                order = bfs(offsets, neighbors, source, distance, parent)
+                source = order[-1]
+                eccentricity = distance[source]
+                component_lower = max(component_lower, eccentricity)
+                component_upper = min(component_upper, 2 * eccentricity)
+                eccentricity_lower = min(eccentricity_lower, eccentricity)
+                if second:
+                    for _ in range(eccentricity // 2):
+                        source = parent[source]
+                _reset(distance, order)
+        diameter_lower = max(diameter_lower, component_lower)
+        diameter_upper = max(diameter_upper, component_upper)
+        if radius_lower is None or (component_lower + 1) // 2 < radius_lower:
+            radius_lower = (component_lower + 1) // 2
+        if radius_upper is None or eccentricity_lower < radius_upper:
+            radius_upper = eccentricity_lower
+    return (diameter_lower, diameter_upper), (radius_lower, radius_upper)
+
+
+def bfs(offsets: array, neighbors: array, source: int, distance: list, parent: list = None) -> list:
+    """
+    Runs a breadth first search from the source, writes the distances into distance (-1 marks unvisited vertices \
+    and must be restored by the caller) and the predecessors into parent if given. \
+    Returns the reached vertices in the order of their distance.
+    """
+    count_searches()
+    distance[source] = 0
+    order = [source]
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        following = []
+        for current in frontier:
+            for i in range(offsets[current], offsets[current + 1]):
+                other = neighbors[i]
+                if distance[other] < 0:
+                    distance[other] = depth
+                    if parent is not None:
+                        parent[other] = current
+                    following.append(other)
+        order.extend(following)
+        frontier = following
+    return order
+
+
+def _bounding_eccentricities(offsets: array, neighbors: array, component: list, distance: list, relevant,
+                             smallest: bool = False) -> tuple:
+    """
+    Returns the (lower, upper) eccentricity bounds of the component's vertices by index, exact for every vertex \
+    that relevant(lower, upper, found) keeps as a candidate, where found is the longest (or, if smallest, \
+    the shortest) eccentricity known so far. The searches alternate between the candidates with the \
+    highest upper and the lowest lower bound, after SINGLE_SEARCHES of them the rest is computed in batches.
+    """
+    lower = {vertex: 0 for vertex in component}
+    upper = {vertex: len(component) for vertex in component}
+    found = len(component) if smallest else 0
+    candidates = set(component)
+    pick_highest = True
+    searches = 0
+    while candidates:
+        if searches == SINGLE_SEARCHES:
+            remaining = list(candidates)
+            for vertex, eccentricity in zip(remaining, bitset_bfs.eccentricities(offsets, neighbors, remaining,
+                                                                                 BATCH_SIZE)):
+                lower[vertex] = upper[vertex] = eccentricity
+            break
+        searches += 1
+        if pick_highest:
+            source = max(candidates, key=lambda vertex: (upper[vertex], _degree(offsets, vertex)))
+        else:
+            source = min(candidates, key=lambda vertex: (lower[vertex], -_degree(offsets, vertex)))
+        pick_highest = not pick_highest
+        order = bfs(offsets, neighbors, source, distance)
+        eccentricity = distance[order[-1]]
+        for vertex in order:
+            d = distance[vertex]
+            bound = d if d > eccentricity - d else eccentricity - d
+            if bound > lower[vertex]:
+                lower[vertex] = bound
+            if eccentricity + d < upper[vertex]:
+                upper[vertex] = eccentricity + d
+        lower[source] = upper[source] = eccentricity
+        _reset(distance, order)
+        if smallest:
+            found = min(found, min(upper[vertex] for vertex in candidates))
+        else:
+            found = max(found, max(lower[vertex] for vertex in candidates))
+        # A vertex is settled once its eccentricity is known or it can not change the result
+        candidates = {vertex for vertex in candidates
+                      if lower[vertex] != upper[vertex] and relevant(lower[vertex], upper[vertex], found)}
+    return lower, upper
+
+
+def _buffers(offsets: array) -> tuple:
+    """
+    Returns the distance (all unvisited) and parent lists shared by the searches of one computation.
+    """
+    size = len(offsets) - 1
+    return [-1] * size, [0] * size
+
+
+def _degree(offsets: array, vertex: int) -> int:
+    """
+    Returns the number of adjacency entries of the vertex.
+    """
+    return offsets[vertex + 1] - offsets[vertex]
+
+
+def _reset(distance: list, order: list) -> None:
+    """
+    Marks the vertices of a finished search as unvisited again, so the distance list can be reused.
+    """
+    for vertex in order:
+        distance[vertex] = -1
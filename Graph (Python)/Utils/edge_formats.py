@@ -0,0 +1,239 @@
+import csv
+import gzip
+
+# Streaming readers and writers for edge list files. The readers are generators of (v1, v2, weight) tuples
+# that hold one line at a time, the writers iterate over the graph's edge set without copying it.
+# Files ending with .gz are written gzip compressed, gzip compressed input is recognized by its magic number.
+# Whitespace and CSV edge lists use the 0 based vertex IDs, DIMACS and Matrix Market files count from 1.
+# The DIMACS and Matrix Market writers declare the number of vertices in their header and number the vertices
+# 1 to n in the order of their IDs, so the slots of removed vertices do not come back as isolated vertices.
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def read_edge_list(path: str, comments: str = "#"):
+    """
+    Yields (v1, v2, weight) for every "v1 v2 [weight]" line of a whitespace separated edge list.\
+    Empty lines and lines starting with the comments prefix are skipped. The weight defaults to 1.
+    """
+    with _open_read(path) as file:
+        for line in file:
+            fields = line.split()
+            if not fields or fields[0].startswith(comments):
+                continue
+            yield _edge(fields, 0, path)
+
+
+def read_csv(path: str, delimiter: str = ",", header: bool = False):
+    """
+    Yields (v1, v2, weight) for every "v1,v2[,weight]" row of a CSV edge list. \
+    The first row is skipped if header is True. The weight defaults to 1.
+    """
+    with _open_read(path) as file:
+        rows = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(rows, None)
+        for row in rows:
+            if row:
+                yield _edge([field.strip() for field in row], 0, path)
+
+
+def read_dimacs(path: str):
+    """
+    Yields (v1, v2, weight) for every arc ("a v1 v2 weight") or edge ("e v1 v2 [weight]") line of a DIMACS file.\
+    The 1 based vertex numbers of the file are turned into 0 based indices.
+    """
+    with _open_read(path) as file:
+        for line in file:
+            fields = line.split()
+            if fields and fields[0] in ("a", "e"):
+                yield _edge(fields[1:], 1, path)
+
+
+def read_matrix_market(path: str, directed: bool = False):
+    """
+    Yields (v1, v2, weight) for every entry of a Matrix Market coordinate file. \
+    The 1 based row and column numbers are turned into 0 based indices.\
+    Pattern matrices give every edge the weight 1. With directed=True, the off-diagonal entries \
+    of symmetric matrices are yielded in both directions, those of skew-symmetric ones also mirrored \
+    with the negated weight.\
+    Raises a ValueError for complex or hermitian matrices and for skew-symmetric ones with directed=False, \
+    which have no edge weights to match.
+    """
+    with _open_read(path) as file:
+        banner = file.readline().split()
+        if len(banner) < 5 or banner[0].lower() != "%%matrixmarket" or banner[2].lower() != "coordinate":
+            raise ValueError(f"{path} is not a Matrix Market coordinate file.")
+        field, symmetry = banner[3].lower(), banner[4].lower()
+        if field == "complex" or symmetry == "hermitian":
+            raise ValueError(f"{path} holds a complex matrix, edge weights must be real.")
+        if symmetry == "skew-symmetric" and not directed:
+            raise ValueError(f"{path} holds a skew-symmetric matrix, which needs a directed graph.")
+        mirror = directed and symmetry in ("symmetric", "skew-symmetric")
+        sign = -1 if symmetry == "skew-symmetric" else 1
+        size_read = False
+        for line in file:
+            fields = line.split()
+            if not fields or fields[0].startswith("%"):
+                continue
+            if not size_read:  # The "rows columns entries" line
+                size_read = True
+                continue
+            v1, v2, weight = _edge(fields[:3], 1, path)
+            yield v1, v2, weight
+            if mirror and v1 != v2:
+                yield v2, v1, sign * weight
+
+
+def declared_vertex_count(path: str, format: str) -> int | None:
+    """
+    Returns the number of vertices declared in the header of DIMACS and Matrix Market files, \
+    None for edge lists (or if there is no declaration). Only reads up to the declaration.
+    """
+    if format == "dimacs":
+        with _open_read(path) as file:
+            for line in file:
+                fields = line.split()
+                if fields and fields[0] == "p":
+                    return int(fields[2])
+                if fields and fields[0] in ("a", "e"):
+                    return None
+    elif format == "mtx":
+        with _open_read(path) as file:
+            for line in file:
+                fields = line.split()
+                if fields and not fields[0].startswith("%"):
+                    return max(int(fields[0]), int(fields[1]))
+    return None
+
+
+def write_edge_list(graph: object, path: str) -> None:
+    """
+    Writes one "v1 v2 [weight]" line per edge. The weights are only written if the graph is weighted.
+    """
+    weighted = graph.is_weighted
+    with _open_write(path) as file:
+        for v1, v2, edge in _edge_ids(graph):
+            file.write(f"{v1} {v2} {edge.weight}\n" if weighted else f"{v1} {v2}\n")
+
+
+def write_csv(graph: object, path: str, delimiter: str = ",") -> None:
+    """
+    Writes one "v1,v2,weight" row per edge.
+    """
+    with _open_write(path) as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        for v1, v2, edge in _edge_ids(graph):
+            writer.writerow((v1, v2, edge.weight))
+
+
+def write_dimacs(graph: object, path: str) -> None:
+    """
+    Writes a DIMACS file: "a v1 v2 weight" arcs for directed graphs, "e v1 v2 [weight]" edges for undirected ones.\
+    The vertices are numbered 1 to n in the order of their IDs (see _edge_numbers()).
+    """
+    directed = graph._directed
+    weighted = graph.is_weighted
+    with _open_write(path) as file:
+        file.write(f"p {'sp' if directed else 'edge'} {len(graph._vertices)} {graph.edge_count}\n")
+        for v1, v2, edge in _edge_numbers(graph):
+            if directed:
+                file.write(f"a {v1} {v2} {edge.weight}\n")
+            elif weighted:
+                file.write(f"e {v1} {v2} {edge.weight}\n")
+            else:
+                file.write(f"e {v1} {v2}\n")
+
+
+def write_matrix_market(graph: object, path: str) -> None:
+    """
+    Writes the adjacency as a Matrix Market coordinate file with one entry per edge: \
+    a general matrix for directed graphs and a symmetric one (lower triangle) for undirected graphs.\
+    Unweighted graphs are written as pattern matrices. The vertices are numbered 1 to n in the order of their IDs.
+    """
+    directed = graph._directed
+    if not graph.is_weighted:
+        field = "pattern"
+    elif all(isinstance(edge.weight, int) for edge in graph._edges):
+        field = "integer"
+    else:
+        field = "real"
+    size = len(graph._vertices)
+    with _open_write(path) as file:
+        file.write(f"%%MatrixMarket matrix coordinate {field} {'general' if directed else 'symmetric'}\n")
+        file.write(f"{size} {size} {graph.edge_count}\n")
+        for row, column, edge in _edge_numbers(graph):
+            if not directed and row < column:
+                row, column = column, row
+            file.write(f"{row} {column}\n" if field == "pattern" else f"{row} {column} {edge.weight}\n")
+
+
+# The readers and writers by format name
+READERS = {"edgelist": read_edge_list, "csv": read_csv, "dimacs": read_dimacs, "mtx": read_matrix_market}
+WRITERS = {"edgelist": write_edge_list, "csv": write_csv, "dimacs": write_dimacs, "mtx": write_matrix_market}
+
+
+def _edge_ids(graph: object):
+    """
+    Yields (v1 ID, v2 ID, edge) for every edge. The IDs are the vertex indices until G.compact() renumbers them.
+    """
+    ids = graph._slot_ids
+    for edge in graph._edges:
+        v1, v2 = edge.vertices
+        if ids is None:
+            yield v1.index, v2.index, edge
+        else:
+            yield ids[v1.index], ids[v2.index], edge
+
+
+def _edge_numbers(graph: object):
+    """
+    Yields (v1 number, v2 number, edge) for every edge, with the vertices numbered 1 to n in the order of their IDs. \
+    The numbers are the IDs + 1 as long as no vertex has been removed.
+    """
+    ids = graph._slot_ids
+    order = sorted(graph._vertices) if ids is None else sorted(graph._vertices, key=ids.__getitem__)
+    numbers = {index: number for number, index in enumerate(order, 1)}
+    for edge in graph._edges:
+        v1, v2 = edge.vertices
+        yield numbers[v1.index], numbers[v2.index], edge
+
+
+def _open_read(path: str):
+    """
+    Opens the file for reading text, decompressing it on the fly if it is gzip compressed.
+    """
+    with open(path, "rb") as file:
+        compressed = file.read(2) == _GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", newline="")
+    return open(path, "r", newline="")
+
+
+def _open_write(path: str):
+    """
+    Opens the file for writing text, gzip compressed if the path ends with .gz.
+    """
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "wt", newline="")
+    return open(path, "w", newline="")
+
+
+def _edge(fields: list, base: int, path: str) -> tuple:
+    """
+    Returns the (v1, v2, weight) tuple of the fields "v1 v2 [weight]" numbered from base.
+    """
+    if len(fields) < 2:
+        raise ValueError(f"Malformed edge {' '.join(fields)!r} in {path}.")
+    weight = _number(fields[2]) if len(fields) > 2 else 1
+    return int(fields[0]) - base, int(fields[1]) - base, weight
+
+
+def _number(text: str) -> int | float:
+    """
+    Parses the weight as an int if possible, else as a float.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
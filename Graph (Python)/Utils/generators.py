@@ -0,0 +1,133 @@
+from math import log
+from random import Random
+
+from graph import Graph
+
+# Seeded generators of synthetic graphs. The same seed always gives the same graph.
+# The vertices are created at once and the edges are streamed into add_edges_from() inside one batch.
+
+
+def erdos_renyi(vertex_count: int, edge_probability: float, seed: int = None,
+                graph_class: type = Graph, storage: str = "dense") -> Graph:
+    """
+    Returns a G(n, p) random graph without self-loops in which every pair of vertices \
+    (every ordered pair for directed graphs) is connected with the given probability.\
+    The pairs without an edge are skipped geometrically, so the time is linear in the number of edges.
+    """
+    assert 0 <= edge_probability <= 1, "The edge probability must be between 0 and 1."
+    return _build(graph_class, storage, vertex_count,
+                  _erdos_renyi_edges(vertex_count, edge_probability, graph_class._directed, Random(seed)))
+
+
+def grid(rows: int, columns: int, graph_class: type = Graph, storage: str = "dense") -> Graph:
+    """
+    Returns the rows x columns grid graph. The vertex in row i and column j has the index i * columns + j.
+    """
+    def edges():
+        for i in range(rows):
+            for j in range(columns):
+                index = i * columns + j
+                if j + 1 < columns:
+                    yield index, index + 1
+                if i + 1 < rows:
+                    yield index, index + columns
+    return _build(graph_class, storage, rows * columns, edges())
+
+
+def barabasi_albert(vertex_count: int, attachment: int, seed: int = None,
+                    graph_class: type = Graph, storage: str = "dense") -> Graph:
+    """
+    Returns a Barabási–Albert preferential attachment graph with a power-law degree distribution. \
+    Starting from attachment isolated vertices, every new vertex is connected to attachment distinct \
+    earlier vertices chosen with a probability proportional to their degree.
+    """
+    assert isinstance(attachment, int) and 1 <= attachment < max(vertex_count, 2), \
+        "The attachment must be a positive integer lower than the vertex count."
+    random = Random(seed)
+
+    def edges():
+        # Every vertex appears in repeated once per edge end, so a uniform pick is proportional to the degree
+        repeated = []
+        targets = list(range(attachment))
+        for source in range(attachment, vertex_count):
+            for target in targets:
+                yield source, target
+            repeated.extend(targets)
+            repeated.extend([source] * attachment)
+            chosen = set()
+            while len(chosen) < attachment:
+                chosen.add(random.choice(repeated))
+            targets = list(chosen)
+    return _build(graph_class, storage, vertex_count, edges())
+
+
+def complete(vertex_count: int, graph_class: type = Graph, storage: str = "dense") -> Graph:
+    """
+    Returns the complete graph (an edge in both directions for directed graphs).
+    """
+    directed = graph_class._directed
+    edges = ((i, j) for i in range(vertex_count) for j in range(vertex_count) if i < j or (directed and i != j))
+    return _build(graph_class, storage, vertex_count, edges)
+
+
+def wheel(vertex_count: int, graph_class: type = Graph, storage: str = "dense") -> Graph:
+    """
+    Returns the wheel graph: vertex 0 is the hub connected to the cycle of the other vertices.
+    """
+    assert vertex_count >= 4, "A wheel has at least 4 vertices."
+
+    def edges():
+        for i in range(1, vertex_count):
+            yield 0, i
+            yield i, i % (vertex_count - 1) + 1
+    return _build(graph_class, storage, vertex_count, edges())
+
+
+def _build(graph_class: type, storage: str, vertex_count: int, edges) -> Graph:
+    """
+    Creates the graph with vertex_count vertices and the given edges.
+    """
+    graph = graph_class(storage=storage)
+    with graph.batch():
+        graph.add_vertices_from(vertex_count)
+        graph.add_edges_from(edges)
+    return graph
+
+
+def _erdos_renyi_edges(vertex_count: int, edge_probability: float, directed: bool, random: Random):
+    """
+    Yields the edges of a G(n, p) graph, skipping the pairs without an edge geometrically (Batagelj and Brandes).
+    """
+    if edge_probability <= 0 or vertex_count < 2:
+        return
+    # The candidate pairs are numbered row by row: i < j for undirected and i != j for directed graphs
+    pair_count = vertex_count * (vertex_count - 1) // (1 if directed else 2)
+    if edge_probability >= 1:
+        positions = range(pair_count)
+    else:
+        positions = _geometric_positions(pair_count, log(1 - edge_probability), random)
+    row, row_start = 0, 0
+    row_length = vertex_count - 1
+    for position in positions:
+        while position >= row_start + row_length:
+            row_start += row_length
+            row += 1
+            if not directed:
+                row_length -= 1
+        column = position - row_start
+        if directed:
+            yield row, column if column < row else column + 1
+        else:
+            yield row, row + 1 + column
+
+
+def _geometric_positions(pair_count: int, log_miss: float, random: Random):
+    """
+    Yields the increasing positions of the successful pairs, each gap drawn from the geometric distribution.
+    """
+    position = -1
+    while True:
+        position += 1 + int(log(1 - random.random()) / log_miss)
+        if position >= pair_count:
+            return
+        yield position
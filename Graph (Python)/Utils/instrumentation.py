@@ -0,0 +1,230 @@
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from types import GeneratorType
+
+# Instrumentation swaps the class of an instrumented graph for a subclass whose hot methods and properties
+# are wrapped with timers. Graphs that are not instrumented run the plain class, so disabled costs nothing.
+# While a timed operation runs, its graph's Instrumentation is the active one of the thread, and the search
+# kernels of Utils count their searches into it through count_searches(), wherever the operation ends up searching.
+
+# The timed methods and properties (the ones a graph class does not have are skipped)
+TIMED_METHODS = ("vertex", "add_vertices_from", "v", "remove_vertex", "edge", "add_edges_from", "e", "remove_edge",
+                 "d", "shortest_path", "dijkstra", "shortest_paths_from", "bfs", "dfs", "deg", "eccentricity",
+                 "connected", "components", "diameter_bounds", "radius_bounds", "compact", "build_landmarks",
+                 "d_bounds", "pagerank", "eigenvector_centrality", "betweenness_centrality", "degree_centrality",
+                 "_update_adj", "_simple_bfs", "_eccentricities", "reachable", "descendants", "ancestors")
+TIMED_PROPERTIES = ("radius", "diameter", "central", "degree_sequence", "distance_matrix", "is_connected",
+                    "component_count", "strongly_connected_components")
+# The methods that are only counted. Each call builds a compressed sparse row index
+COUNTED_METHODS = {"_csr_entries": "csr_rebuilds", "_csr_in_entries": "csr_rebuilds"}
+# The counters derived from the call counts of the timed operations
+DERIVED_COUNTERS = {"matrix_rebuilds": ("_update_adj",)}
+# The counter of single source searches (breadth first, depth first and Dijkstra) run by the kernels.\
+# A point to point search counts once, the multi-source searches count one per source
+SEARCH_COUNTER = "searches"
+
+# The instrumented subclass of every graph class
+_subclasses: dict = {}
+# The Instrumentation of the timed operation running in the current thread, None outside of one
+_active: ContextVar = ContextVar("instrumentation", default=None)
+
+
+class Instrumentation:
+    """
+    Collects the call counts and timings of the instrumented operations of one graph.\
+    The last sample_size durations of every operation are kept for the percentiles.
+    """
+
+    # Dunder methods
+
+    def __init__(self, callback=None, sample_size: int = 1024) -> None:
+
+        # Called with (operation, seconds) after every timed call, e.g. to forward the metrics to an exporter
+        self.callback = callback
+        # The number of durations kept per operation
+        self._sample_size: int = sample_size
+        # The call count, summed and maximum duration and the recent durations by operation name
+        self._calls: dict = {}
+        self._totals: dict = {}
+        self._maxima: dict = {}
+        self._samples: dict = {}
+        # The counts of the counted methods by counter name
+        self._counters: dict = {}
+
+    # Instance methods
+
+    def record(self, operation: str, seconds: float) -> None:
+        """
+        Records one call of the operation that took the given time and passes it on to the callback.
+        """
+        self._calls[operation] = self._calls.get(operation, 0) + 1
+        self._totals[operation] = self._totals.get(operation, 0.0) + seconds
+        if seconds > self._maxima.get(operation, 0.0):
+            self._maxima[operation] = seconds
+        samples = self._samples.get(operation)
+        if samples is None:
+            samples = self._samples[operation] = deque(maxlen=self._sample_size)
+        samples.append(seconds)
+        if self.callback is not None:
+            self.callback(operation, seconds)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds the amount to the counter.
+        """
+        self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self) -> dict:
+        """
+        Returns the call count, total, mean, maximum and 50th, 90th and 99th percentile seconds of every \
+        operation along with the counters of matrix and index rebuilds and single source searches \
+        (see SEARCH_COUNTER).
+        """
+        operations = {}
+        for operation, calls in sorted(self._calls.items()):
+            samples = sorted(self._samples[operation])
+            operations[operation] = {
+                "calls": calls,
+                "total": self._totals[operation],
+                "mean": self._totals[operation] / calls,
+                "max": self._maxima[operation],
+                "p50": _percentile(samples, 50),
+                "p90": _percentile(samples, 90),
+                "p99": _percentile(samples, 99),
+            }
+        counters = {counter: sum(self._calls.get(operation, 0) for operation in operations_of_counter)
+                    for counter, operations_of_counter in DERIVED_COUNTERS.items()}
+        for counter in (*COUNTED_METHODS.values(), SEARCH_COUNTER):
+            counters[counter] = self._counters.get(counter, 0)
+        return {"operations": operations, "counters": counters}
+
+    def reset(self) -> None:
+        """
+        Drops all recorded numbers.
+        """
+        self._calls.clear()
+        self._totals.clear()
+        self._maxima.clear()
+        self._samples.clear()
+        self._counters.clear()
+
+
+def enable(graph: object, callback=None) -> Instrumentation:
+    """
+    Instruments the graph (or replaces the callback if it already is) and returns its Instrumentation.
+    """
+    if graph._instrumentation is None:
+        graph._instrumentation = Instrumentation(callback)
+        graph.__class__ = instrumented_class(type(graph))
+    else:
+        graph._instrumentation.callback = callback
+    return graph._instrumentation
+
+
+def disable(graph: object) -> None:
+    """
+    Restores the plain class of the graph. The recorded numbers stay available until the graph is instrumented again.
+    """
+    if graph._instrumentation is not None and type(graph) in _subclasses.values():
+        graph.__class__ = type(graph).__bases__[0]
+
+
+def count_searches(amount: int = 1) -> None:
+    """
+    Counts searches of a kernel into the active Instrumentation. Does nothing outside of a timed operation.
+    """
+    active = _active.get()
+    if active is not None:
+        active.count(SEARCH_COUNTER, amount)
+
+
+def instrumented_class(graph_class: type) -> type:
+    """
+    Returns the subclass of the graph class with the timed and counted wrappers. Created once per class.
+    """
+    subclass = _subclasses.get(graph_class)
+    if subclass is None:
+        namespace = {"__module__": graph_class.__module__, "__qualname__": graph_class.__qualname__}
+        for name in TIMED_METHODS:
+            if hasattr(graph_class, name):
+                namespace[name] = _timed(name, getattr(graph_class, name))
+        for name in TIMED_PROPERTIES:
+            prop = getattr(graph_class, name, None)
+            if isinstance(prop, property):
+                namespace[name] = property(_timed(name, prop.fget), prop.fset, prop.fdel, prop.__doc__)
+        for name, counter in COUNTED_METHODS.items():
+            if hasattr(graph_class, name):
+                namespace[name] = _counted(counter, getattr(graph_class, name))
+        subclass = _subclasses[graph_class] = type(graph_class.__name__, (graph_class,), namespace)
+    return subclass
+
+
+def _timed(operation: str, function):
+    """
+    Wraps the method so every call is timed and recorded in the graph's instrumentation.\
+    A returned generator (a lazy traversal) is timed while it is consumed and recorded once it is \
+    exhausted or closed, along with the time it took to create it.
+    """
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self._instrumentation
+        token = _active.set(instrumentation)
+        start = perf_counter()
+        try:
+            result = function(self, *args, **kwargs)
+        except BaseException:
+            instrumentation.record(operation, perf_counter() - start)
+            raise
+        finally:
+            _active.reset(token)
+        if isinstance(result, GeneratorType):
+            return _timed_generator(instrumentation, operation, result, perf_counter() - start)
+        instrumentation.record(operation, perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def _timed_generator(instrumentation: Instrumentation, operation: str, generator, seconds: float):
+    """
+    Yields the items of the generator, timing every step with the instrumentation active, \
+    and records the summed time when the generator is exhausted or closed.
+    """
+    try:
+        while True:
+            token = _active.set(instrumentation)
+            start = perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                seconds += perf_counter() - start
+                _active.reset(token)
+            yield item
+    finally:
+        generator.close()
+        instrumentation.record(operation, seconds)
+
+
+def _counted(counter: str, function):
+    """
+    Wraps the method so every call increments the counter of the graph's instrumentation.
+    """
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        self._instrumentation.count(counter)
+        return function(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _percentile(samples: list, percent: int) -> float:
+    """
+    Returns the nearest-rank percentile of the sorted samples.
+    """
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, -(-len(samples) * percent // 100) - 1))]
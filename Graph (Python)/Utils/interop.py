@@ -0,0 +1,112 @@
+# NumPy and SciPy are optional. They are imported on first use so the rest of the package works without them.
+
+
+def _numpy():
+    """
+    Returns the numpy module. Raises an ImportError with an installation hint if it is missing.
+    """
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("The NumPy interoperability requires numpy (pip install numpy).") from error
+    return numpy
+
+
+def _sparse():
+    """
+    Returns the scipy.sparse module. Raises an ImportError with an installation hint if it is missing.
+    """
+    try:
+        from scipy import sparse
+    except ImportError as error:
+        raise ImportError("The SciPy interoperability requires scipy (pip install scipy).") from error
+    return sparse
+
+
+def csr_arrays(graph: object) -> tuple:
+    """
+    Returns the (indptr, indices, data) NumPy arrays of the graph's adjacency, one row per vertex index.\
+    The arrays are read-only views of the graph's compressed sparse row buffers (no copy), \
+    except for undirected graphs with self-loops: every self-loop is listed twice in its row \
+    and is only kept once in a copy, the same way G.adj counts it.
+    """
+    numpy = _numpy()
+    csr = graph._csr_adjacency()
+    indptr = numpy.frombuffer(csr.offsets, dtype=numpy.int64)
+    indices = numpy.frombuffer(csr.neighbors, dtype=numpy.int64)
+    data = numpy.frombuffer(csr.weights, dtype=numpy.int64 if csr.weights.typecode == "q" else numpy.float64)
+    if not graph._directed and graph._self_loop_count:
+        rows = numpy.repeat(numpy.arange(len(indptr) - 1), numpy.diff(indptr))
+        # Both entries of a self-loop are next to each other in its row, the second one is dropped
+        keep = numpy.ones(len(indices), dtype=bool)
+        keep[numpy.flatnonzero(indices == rows)[1::2]] = False
+        indices = indices[keep]
+        data = data[keep]
+        indptr = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(rows[keep], minlength=len(indptr) - 1))))
+    for array in (indptr, indices, data):
+        # The buffers belong to the graph's adjacency index
+        array.flags.writeable = False
+    return indptr, indices, data
+
+
+def to_scipy_sparse(graph: object) -> object:
+    """
+    Returns the adjacency as a scipy.sparse.csr_array sharing the graph's buffers (see csr_arrays()).\
+    Parallel edges are separate entries that SciPy sums like G.adj does.
+    """
+    indptr, indices, data = csr_arrays(graph)
+    size = len(indptr) - 1
+    return _sparse().csr_array((data, indices, indptr), shape=(size, size), copy=False)
+
+
+def to_numpy(graph: object) -> object:
+    """
+    Returns the adjacency as a dense NumPy array with the summed weights between every two vertices, \
+    filled from the sparse adjacency in O(E) after the O(V²) allocation. Removed vertices have zero rows and columns.
+    """
+    numpy = _numpy()
+    indptr, indices, data = csr_arrays(graph)
+    size = len(indptr) - 1
+    matrix = numpy.zeros((size, size), dtype=data.dtype)
+    rows = numpy.repeat(numpy.arange(size), numpy.diff(indptr))
+    numpy.add.at(matrix, (rows, indices), data)
+    return matrix
+
+
+def sparse_edges(matrix: object, directed: bool) -> tuple:
+    """
+    Returns the vertex count and the (v1, v2, weight) edges of a square SciPy sparse matrix, one edge per \
+    non-zero entry. Undirected graphs only take the upper triangle of the matrix, which must be symmetric.
+    """
+    coo = _sparse().coo_array(matrix)
+    coo.sum_duplicates()
+    return _matrix_edges(coo.shape, coo.row, coo.col, coo.data, directed,
+                         lambda: (abs(coo - coo.T) > 0).nnz == 0)
+
+
+def dense_edges(matrix: object, directed: bool) -> tuple:
+    """
+    Returns the vertex count and the (v1, v2, weight) edges of a square NumPy array (or anything array like), \
+    one edge per non-zero entry. Undirected graphs only take the upper triangle of the matrix, which must be symmetric.
+    """
+    numpy = _numpy()
+    matrix = numpy.asarray(matrix)
+    if matrix.ndim != 2:
+        raise ValueError("The adjacency matrix must be square.")
+    rows, columns = numpy.nonzero(matrix)
+    return _matrix_edges(matrix.shape, rows, columns, matrix[rows, columns], directed,
+                         lambda: numpy.array_equal(matrix, matrix.T))
+
+
+def _matrix_edges(shape: tuple, rows: object, columns: object, data: object, directed: bool, symmetric) -> tuple:
+    """
+    Checks the shape (and the symmetry of undirected adjacencies) and zips the coordinates into edge tuples.
+    """
+    if shape[0] != shape[1]:
+        raise ValueError("The adjacency matrix must be square.")
+    if not directed:
+        if not symmetric():
+            raise ValueError("The adjacency matrix of an undirected graph must be symmetric.")
+        upper = rows <= columns
+        rows, columns, data = rows[upper], columns[upper], data[upper]
+    return shape[0], zip(rows.tolist(), columns.tolist(), data.tolist())
@@ -0,0 +1,223 @@
+from array import array
+from math import log2
+from random import Random
+
+from Utils.csr import CSRAdjacency
+from Utils import parallel, shortest_paths
+
+# Landmark distance oracle (ALT: A*, landmarks and the triangle inequality, Goldberg and Harrelson).
+# For every landmark L the shortest distances d(L, x) (and d(x, L) in directed graphs) to every vertex x are stored.
+# The triangle inequality then bounds any distance: d(L, v) - d(L, u) <= d(u, v) <= d(u, L) + d(L, v).
+
+# The landmark selection strategies
+STRATEGIES = ("farthest", "degree", "random")
+
+_INFINITY = float("inf")
+
+
+class LandmarkIndex:
+    """
+    The shortest distances between a few landmark vertices and every vertex of one graph version, \
+    one array of floats per landmark and direction (infinity for unreachable vertices).\
+    Answers lower and upper distance bounds in O(landmarks) and provides the A* heuristic of exact searches.
+    """
+
+    # Dunder methods
+
+    def __init__(self, version: int, landmarks: list, forward: list, backward: list | None = None,
+                 guided: bool = True) -> None:
+
+        # The graph version the distances were computed for
+        self._version: int = version
+        # The vertex indices of the landmarks
+        self._landmarks: list = landmarks
+        # forward[i][x] is the distance from landmark i to vertex x, backward[i][x] the one from x to landmark i.\
+        # Both are the same arrays for undirected graphs
+        self._forward: list = forward
+        self._backward: list = forward if backward is None else backward
+        # Whether the point to point searches of the graph use the landmarks
+        self._guided: bool = guided
+
+    def __len__(self) -> int:
+        return len(self._landmarks)
+
+    def __repr__(self) -> str:
+        return f"LandmarkIndex(version={self._version}, landmarks={self._landmarks})"
+
+    # Properties
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the graph version the index was built for.
+        """
+        return self._version
+
+    @property
+    def landmarks(self) -> list:
+        """
+        Returns the vertex indices of the landmarks.
+        """
+        return list(self._landmarks)
+
+    @property
+    def guided(self) -> bool:
+        """
+        Whether G.d() and G.shortest_path() run landmark guided (ALT) searches with this index.
+        """
+        return self._guided
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the size of the distance arrays in bytes.
+        """
+        arrays = self._forward if self._backward is self._forward else self._forward + self._backward
+        return sum(len(distances) * distances.itemsize for distances in arrays)
+
+    # Instance methods
+
+    def bounds(self, origin: int, destination: int) -> tuple:
+        """
+        Returns (lower, upper) bounds of the shortest distance from the origin to the destination index, \
+        (inf, inf) if a landmark proves the destination unreachable.
+        """
+        if origin == destination:
+            return 0, 0
+        lower = self.lower_bound(origin, destination)
+        if lower == _INFINITY:
+            return _INFINITY, _INFINITY
+        upper = min((backward[origin] + forward[destination]
+                     for forward, backward in zip(self._forward, self._backward)), default=_INFINITY)
+        return lower, upper
+
+    def lower_bound(self, origin: int, destination: int) -> float:
+        """
+        Returns the best lower bound of the distance from the origin to the destination over all landmarks.\
+        A vertex that a landmark reaches (or that reaches a landmark) while the other one does not \
+        can not reach the other one either, the bound is infinite then.
+        """
+        best = 0
+        for forward, backward in zip(self._forward, self._backward):
+            from_landmark = forward[origin]
+            if from_landmark != _INFINITY and forward[destination] - from_landmark > best:
+                best = forward[destination] - from_landmark
+            to_landmark = backward[destination]
+            if to_landmark != _INFINITY and backward[origin] - to_landmark > best:
+                best = backward[origin] - to_landmark
+        return best
+
+    def heuristic(self, destination: int):
+        """
+        Returns the A* heuristic towards the destination: a function of a vertex index that returns \
+        the lower bound of its distance to the destination. The landmark bounds are consistent.
+        """
+        columns = [(forward, backward, forward[destination], backward[destination])
+                   for forward, backward in zip(self._forward, self._backward)]
+
+        def estimate(index: int) -> float:
+            best = 0
+            for forward, backward, forward_destination, backward_destination in columns:
+                from_landmark = forward[index]
+                if from_landmark != _INFINITY and forward_destination - from_landmark > best:
+                    best = forward_destination - from_landmark
+                if backward_destination != _INFINITY and backward[index] - backward_destination > best:
+                    best = backward[index] - backward_destination
+            return best
+
+        return estimate
+
+    def reverse_heuristic(self, origin: int):
+        """
+        Returns the heuristic of a backward search towards the origin: a function of a vertex index \
+        that returns the lower bound of the distance from the origin to it.
+        """
+        columns = [(forward, backward, forward[origin], backward[origin])
+                   for forward, backward in zip(self._forward, self._backward)]
+
+        def estimate(index: int) -> float:
+            best = 0
+            for forward, backward, forward_origin, backward_origin in columns:
+                if forward_origin != _INFINITY and forward[index] - forward_origin > best:
+                    best = forward[index] - forward_origin
+                to_landmark = backward[index]
+                if to_landmark != _INFINITY and backward_origin - to_landmark > best:
+                    best = backward_origin - to_landmark
+            return best
+
+        return estimate
+
+
+def build(version: int, csr: CSRAdjacency, in_csr: CSRAdjacency | None, vertices: list, count: int,
+          strategy: str = "farthest", seed: int = None, kept: list = (), unit: bool = False,
+          workers: int = 1, guided: bool = None) -> LandmarkIndex:
+    """
+    Picks count landmarks among the vertex indices (the kept ones first, e.g. the landmarks of the previous \
+    version) and computes their distance arrays. in_csr is the incoming adjacency of directed graphs, \
+    None for undirected ones. unit=True uses breadth first searches when every weight is 1.\
+    "farthest" picks every next landmark among the vertices farthest from the ones picked so far \
+    (unreached vertices first, so every component gets one), which needs the searches one after another. \
+    "degree" and "random" pick all landmarks upfront, their searches run in a pool of workers processes.\
+    guided=None guides the point to point searches if the first landmark's farthest vertex is more than \
+    2 log2(n) edges away: the guidance pays off on graphs with long shortest paths (meshes, road networks), \
+    while on small-world graphs the plain bidirectional search meets after a few levels and the O(landmarks) \
+    bound of every touched vertex costs more than it saves.
+    """
+    assert strategy in STRATEGIES, f"The strategy must be one of {', '.join(STRATEGIES)}."
+    count = min(count, len(vertices))
+    landmarks = list(kept)[:count]
+    forward = _searches(csr, landmarks, unit, workers)
+    if strategy == "farthest":
+        closest = array("d", [_INFINITY]) * (len(csr.offsets) - 1)
+        for distances in forward:
+            _merge(closest, distances)
+        if not landmarks and count:
+            # The search from a start vertex finds the first landmark on the periphery and is not kept
+            start = Random(seed).choice(vertices) if seed is not None else max(vertices, key=csr.degree)
+            reached = shortest_paths.distance_array(csr.offsets, csr.neighbors, csr.weights, start, unit)
+            landmarks.append(max(vertices, key=lambda index: (reached[index] != _INFINITY, reached[index])))
+            forward.append(shortest_paths.distance_array(csr.offsets, csr.neighbors, csr.weights, landmarks[0], unit))
+            _merge(closest, forward[0])
+        while len(landmarks) < count:
+            landmark = max(vertices, key=lambda index: (closest[index], csr.degree(index)))
+            if closest[landmark] == 0:
+                break
+            landmarks.append(landmark)
+            forward.append(shortest_paths.distance_array(csr.offsets, csr.neighbors, csr.weights, landmark, unit))
+            _merge(closest, forward[-1])
+    else:
+        chosen = set(landmarks)
+        remaining = [index for index in vertices if index not in chosen]
+        if strategy == "degree":
+            picked = sorted(remaining, key=lambda index: -csr.degree(index))[:count - len(landmarks)]
+        else:
+            picked = Random(seed).sample(remaining, count - len(landmarks))
+        landmarks.extend(picked)
+        forward.extend(_searches(csr, picked, unit, workers))
+    backward = None if in_csr is None else _searches(in_csr, landmarks, unit, workers)
+    if guided is None:
+        guided = False
+        if landmarks:
+            hops = forward[0] if unit else shortest_paths.distance_array(csr.offsets, csr.neighbors, csr.weights,
+                                                                         landmarks[0], True)
+            guided = max(hop for hop in hops if hop != _INFINITY) > 2 * log2(len(vertices))
+    return LandmarkIndex(version, landmarks, forward, backward, guided)
+
+
+def _searches(csr: CSRAdjacency, sources: list, unit: bool, workers: int) -> list:
+    """
+    Returns the distance arrays from the sources, computed in a process pool if workers > 1.
+    """
+    if workers > 1 and len(sources) > 1:
+        return parallel.landmark_distances(csr.offsets, csr.neighbors, csr.weights, sources, unit, workers)
+    return [shortest_paths.distance_array(csr.offsets, csr.neighbors, csr.weights, source, unit)
+            for source in sources]
+
+
+def _merge(closest: array, distances: array) -> None:
+    """
+    Lowers the distance to the closest landmark of every vertex to the given distances where they are shorter.
+    """
+    for index in range(len(closest)):
+        if distances[index] < closest[index]:
+            closest[index] = distances[index]
@@ -0,0 +1,176 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+from Utils import bitset_bfs, shortest_paths
+from Utils.instrumentation import count_searches
+
+# The shared buffers of a worker process, attached once by _attach()
+_shared: dict = {}
+# The number of sources below which the distance matrix is computed in the calling process. Starting the pool \
+# costs about 0.05-0.1s, about what the serial multi-source search takes for 500 vertices
+MIN_PARALLEL_SOURCES = 1000
+
+
+def default_workers() -> int:
+    """
+    Returns the number of worker processes used when none is given (the number of usable CPU cores).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on every platform
+        return os.cpu_count() or 1
+
+
+def all_pairs_distances(offsets: array, neighbors: array, sources: list, workers: int = None) -> list:
+    """
+    Returns the unweighted distance matrix of a compressed sparse row adjacency as a list of rows.\
+    The sources are split into chunks of at most one bitset batch (see bitset_bfs.distance_rows()) between \
+    the processes of a pool that read the adjacency from and write their rows into shared memory blocks.\
+    Unreachable vertices and the rows of vertices that are not sources have a distance of 0.
+    """
+    count_searches(len(sources))
+    size = len(offsets) - 1
+    workers = workers or default_workers()
+    blocks = []
+    try:
+        names = []
+        for typecode, length in (("q", size + 1), ("q", len(neighbors)), ("i", size * size)):
+            # Zero sized blocks are not allowed
+            block = shared_memory.SharedMemory(create=True, size=max(1, length) * array(typecode).itemsize)
+            blocks.append(block)
+            names.append((block.name, typecode, length))
+        _view(blocks[0], "q", size + 1)[:] = offsets
+        _view(blocks[1], "q", len(neighbors))[:] = neighbors
+        # Every worker gets at least one chunk, a chunk is at most one batch of the multi-source search
+        chunk_size = max(1, min(bitset_bfs.DISTANCE_WIDTH, -(-len(sources) // workers)))
+        chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(names, ("offsets", "neighbors", "result"))) as pool:
+            for _ in pool.map(_distance_rows, chunks):
+                pass
+        result = _view(blocks[2], "i", size * size)
+        matrix = [result[i * size:(i + 1) * size].tolist() for i in range(size)]
+        result.release()
+        return matrix
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def landmark_distances(offsets: array, neighbors: array, weights: array, sources: list, unit: bool,
+                       workers: int = None) -> list:
+    """
+    Returns the shortest distance arrays (see shortest_paths.distance_array()) from every source, \
+    one search per source split between the processes of a pool that share the adjacency and the result.
+    """
+    count_searches(len(sources))
+    size = len(offsets) - 1
+    workers = workers or default_workers()
+    blocks = []
+    try:
+        names = []
+        for typecode, length in (("q", size + 1), ("q", len(neighbors)), (weights.typecode, len(weights)),
+                                 ("d", size * len(sources))):
+            block = shared_memory.SharedMemory(create=True, size=max(1, length) * array(typecode).itemsize)
+            blocks.append(block)
+            names.append((block.name, typecode, length))
+        _view(blocks[0], "q", size + 1)[:] = offsets
+        _view(blocks[1], "q", len(neighbors))[:] = neighbors
+        _view(blocks[2], weights.typecode, len(weights))[:] = weights
+        rows = [(row, source, unit) for row, source in enumerate(sources)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(names, ("offsets", "neighbors", "weights", "result"))) as pool:
+            for _ in pool.map(_distance_row, rows):
+                pass
+        result = _view(blocks[3], "d", size * len(sources))
+        distances = [array("d", result[row * size:(row + 1) * size]) for row in range(len(sources))]
+        result.release()
+        return distances
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def betweenness_dependencies(offsets: array, neighbors: array, weights: array, sources: list, unit: bool,
+                             workers: int = None) -> array:
+    """
+    Returns the summed dependencies of every vertex on the shortest paths from the sources \
+    (see shortest_paths.dependencies()). The sources are split into chunks between the processes of a pool \
+    that share the adjacency, every chunk returns its partial dependency vector and the vectors are summed.
+    """
+    count_searches(len(sources))
+    size = len(offsets) - 1
+    workers = workers or default_workers()
+    blocks = []
+    try:
+        names = []
+        for typecode, length in (("q", size + 1), ("q", len(neighbors)), (weights.typecode, len(weights))):
+            block = shared_memory.SharedMemory(create=True, size=max(1, length) * array(typecode).itemsize)
+            blocks.append(block)
+            names.append((block.name, typecode, length))
+        _view(blocks[0], "q", size + 1)[:] = offsets
+        _view(blocks[1], "q", len(neighbors))[:] = neighbors
+        _view(blocks[2], weights.typecode, len(weights))[:] = weights
+        chunk_size = max(1, len(sources) // (workers * 4))
+        chunks = [(sources[i:i + chunk_size], unit) for i in range(0, len(sources), chunk_size)]
+        result = array("d", bytes(8 * size))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(names, ("offsets", "neighbors", "weights"))) as pool:
+            for partial in pool.map(_dependencies, chunks):
+                for index in range(size):
+                    result[index] += partial[index]
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _view(block: shared_memory.SharedMemory, typecode: str, length: int) -> memoryview:
+    """
+    Returns a typed view of the first length items of the shared memory block.
+    """
+    return block.buf.cast(typecode)[:length]
+
+
+def _attach(names: list, keys: tuple) -> None:
+    """
+    Pool initializer. Attaches the worker to the shared blocks and stores their views under the keys.
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in names]
+    _shared["blocks"] = blocks
+    _shared.update(zip(keys, (_view(block, typecode, length)
+                              for block, (_, typecode, length) in zip(blocks, names))))
+
+
+def _distance_rows(chunk: list) -> None:
+    """
+    Runs the multi-source breadth first search of the chunk and writes its rows into the result block.
+    """
+    offsets = _shared["offsets"]
+    result = _shared["result"]
+    size = len(offsets) - 1
+    for source, row in bitset_bfs.distance_rows(offsets, _shared["neighbors"], chunk).items():
+        result[source * size:(source + 1) * size] = array("i", row)
+
+
+def _distance_row(task: tuple) -> None:
+    """
+    Runs the shortest path search of one source and writes its distances into the result block.
+    """
+    row, source, unit = task
+    size = len(_shared["offsets"]) - 1
+    _shared["result"][row * size:(row + 1) * size] = shortest_paths.distance_array(
+        _shared["offsets"], _shared["neighbors"], _shared["weights"], source, unit)
+
+
+def _dependencies(task: tuple) -> array:
+    """
+    Returns the partial dependency vector of one chunk of sources.
+    """
+    sources, unit = task
+    return shortest_paths.dependencies(_shared["offsets"], _shared["neighbors"], _shared["weights"], sources, unit)
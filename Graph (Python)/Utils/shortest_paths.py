@@ -0,0 +1,312 @@
+from array import array
+from heapq import heappop, heappush
+
+from Utils.instrumentation import count_searches
+
+_INFINITY = float("inf")
+
+
+def dijkstra(offsets: array, neighbors: array, weights: array, source: int) -> tuple:
+    """
+    Single source Dijkstra on a compressed sparse row adjacency using a binary heap.\
+    Returns (distances, parents): dictionaries mapping every reachable vertex index to its distance \
+    from the source and to its predecessor on a shortest path (None for the source).
+    """
+    count_searches()
+    distances = {source: 0}
+    parents = {source: None}
+    settled = set()
+    heap = [(0, source)]
+    while heap:
+        distance, current = heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            new_distance = distance + _checked(weights[i])
+            if new_distance < distances.get(other, _INFINITY):
+                distances[other] = new_distance
+                parents[other] = current
+                heappush(heap, (new_distance, other))
+    return distances, parents
+
+
+def bidirectional_dijkstra(forward: tuple, backward: tuple, source: int, target: int) -> tuple:
+    """
+    Point to point Dijkstra that searches forward from the source and backward from the target at once \
+    and stops as soon as the two searches can no longer improve the best meeting point.\
+    forward and backward are (offsets, neighbors, weights) of the outgoing and incoming adjacency \
+    (the same adjacency for undirected graphs).\
+    Returns (distance, path) with the path as a list of vertex indices, or (None, []) if the target is unreachable.
+    """
+    count_searches()
+    if source == target:
+        return 0, [source]
+    adjacency = (forward, backward)
+    distances = ({source: 0}, {target: 0})
+    parents = ({source: None}, {target: None})
+    settled = (set(), set())
+    heaps = ([(0, source)], [(0, target)])
+    best = _INFINITY
+    meeting = None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Expand the side with the smaller tentative distance
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, current = heappop(heaps[side])
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
+        offsets, neighbors, weights = adjacency[side]
+        own, opposite = distances[side], distances[1 - side]
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            new_distance = distance + _checked(weights[i])
+            if new_distance < own.get(other, _INFINITY):
+                own[other] = new_distance
+                parents[side][other] = current
+                heappush(heaps[side], (new_distance, other))
+            if other in opposite and own[other] + opposite[other] < best:
+                best = own[other] + opposite[other]
+                meeting = other
+    if meeting is None:
+        return None, []
+    path = reconstruct_path(parents[0], meeting)
+    current = parents[1][meeting]
+    while current is not None:
+        path.append(current)
+        current = parents[1][current]
+    return best, path
+
+
+def distance_array(offsets: array, neighbors: array, weights: array, source: int, unit: bool = False) -> array:
+    """
+    Returns the shortest distances from the source to every vertex index as an array of floats, \
+    infinity for unreachable vertices. With unit=True (every weight is 1) a breadth first search replaces Dijkstra.
+    """
+    count_searches()
+    size = len(offsets) - 1
+    distance = array("d", [_INFINITY]) * size
+    distance[source] = 0
+    if unit:
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            following = []
+            for current in frontier:
+                for i in range(offsets[current], offsets[current + 1]):
+                    other = neighbors[i]
+                    if distance[other] == _INFINITY:
+                        distance[other] = depth
+                        following.append(other)
+            frontier = following
+        return distance
+    settled = bytearray(size)
+    heap = [(0, source)]
+    while heap:
+        current_distance, current = heappop(heap)
+        if settled[current]:
+            continue
+        settled[current] = 1
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            new_distance = current_distance + _checked(weights[i])
+            if new_distance < distance[other]:
+                distance[other] = new_distance
+                heappush(heap, (new_distance, other))
+    return distance
+
+
+def bidirectional_a_star(forward: tuple, backward: tuple, source: int, target: int, to_target, from_source) -> tuple:
+    """
+    Bidirectional A* search with the average potential of both directions (consistent for both searches): \
+    to_target(index) and from_source(index) must return consistent lower bounds of the distance from the vertex \
+    to the target and from the source to the vertex, infinity if there is no such path (the vertex is skipped).\
+    forward and backward are as in bidirectional_dijkstra(). Returns (distance, path) with the path as a list \
+    of vertex indices, or (None, []) if the target is unreachable.
+    """
+    count_searches()
+    if source == target:
+        return 0, [source]
+    potentials = {}
+
+    def potential(index: int) -> float:
+        # Half the difference of the bounds. The reverse search uses the negated potential
+        value = potentials.get(index)
+        if value is None:
+            ahead, behind = to_target(index), from_source(index)
+            if ahead == _INFINITY:
+                value = _INFINITY
+            elif behind == _INFINITY:
+                value = -_INFINITY
+            else:
+                value = (ahead - behind) / 2
+            potentials[index] = value
+        return value
+
+    if potential(source) == _INFINITY or potential(target) == -_INFINITY:
+        return None, []
+    adjacency = (forward, backward)
+    signs = (1, -1)
+    distances = ({source: 0}, {target: 0})
+    parents = ({source: None}, {target: None})
+    settled = (set(), set())
+    heaps = ([(potential(source), source)], [(-potential(target), target)])
+    best = _INFINITY
+    meeting = None
+    while heaps[0] and heaps[1]:
+        # The keys of both sides add up to the length of the best path through their vertices
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, current = heappop(heaps[side])
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
+        offsets, neighbors, weights = adjacency[side]
+        own, opposite = distances[side], distances[1 - side]
+        sign = signs[side]
+        distance = own[current]
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            new_distance = distance + _checked(weights[i])
+            if new_distance < own.get(other, _INFINITY):
+                estimate = sign * potential(other)
+                if estimate == _INFINITY:
+                    continue
+                own[other] = new_distance
+                parents[side][other] = current
+                heappush(heaps[side], (new_distance + estimate, other))
+                if other in opposite and new_distance + opposite[other] < best:
+                    best = new_distance + opposite[other]
+                    meeting = other
+    if meeting is None:
+        return None, []
+    path = reconstruct_path(parents[0], meeting)
+    current = parents[1][meeting]
+    while current is not None:
+        path.append(current)
+        current = parents[1][current]
+    return best, path
+
+
+def dependencies(offsets: array, neighbors: array, weights: array, sources: list, unit: bool = False) -> array:
+    """
+    Returns the summed dependencies of every vertex index on the shortest paths from the sources \
+    (the single source phase of Brandes' betweenness algorithm): for every source s and every vertex v \
+    the share of the shortest paths from s to the other vertices that pass through v.\
+    A breadth first search builds the shortest path DAG if unit, Dijkstra otherwise. \
+    Paths are sequences of vertices, so parallel edges do not multiply them and self-loops are never on them.
+    """
+    count_searches(len(sources))
+    size = len(offsets) - 1
+    result = array("d", bytes(8 * size))
+    distance = [-1] * size
+    # The number of shortest paths from the source, the dependency and the DAG predecessors of every vertex
+    sigma = [0] * size
+    delta = [0.0] * size
+    predecessors = [[] for _ in range(size)]
+    for source in sources:
+        if unit:
+            order = _path_dag_bfs(offsets, neighbors, source, distance, sigma, predecessors)
+        else:
+            order = _path_dag_dijkstra(offsets, neighbors, weights, source, distance, sigma, predecessors)
+        # Farthest vertices first, so every vertex is complete before it passes its dependency on
+        for current in reversed(order):
+            coefficient = (1 + delta[current]) / sigma[current]
+            for predecessor in predecessors[current]:
+                delta[predecessor] += sigma[predecessor] * coefficient
+            if current != source:
+                result[current] += delta[current]
+        for current in order:
+            distance[current] = -1
+            sigma[current] = 0
+            delta[current] = 0.0
+            predecessors[current] = []
+    return result
+
+
+def reconstruct_path(parents: dict, target: int) -> list:
+    """
+    Returns the path from the search's source to the target by following the parents back, \
+    or an empty list if the target was not reached.
+    """
+    if target not in parents:
+        return []
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = parents[current]
+    path.reverse()
+    return path
+
+
+def _path_dag_bfs(offsets: array, neighbors: array, source: int, distance: list, sigma: list,
+                  predecessors: list) -> list:
+    """
+    Fills the distance (-1 for unvisited), shortest path count and predecessor lists of the vertices \
+    reached by a breadth first search and returns them in the order of their distance.
+    """
+    distance[source] = 0
+    sigma[source] = 1
+    order = [source]
+    for current in order:
+        following = distance[current] + 1
+        paths = sigma[current]
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            if distance[other] < 0:
+                distance[other] = following
+                order.append(other)
+            if distance[other] == following:
+                # A parallel edge lists the current vertex again right after its first entry
+                known = predecessors[other]
+                if not known or known[-1] != current:
+                    sigma[other] += paths
+                    known.append(current)
+    return order
+
+
+def _path_dag_dijkstra(offsets: array, neighbors: array, weights: array, source: int, distance: list,
+                       sigma: list, predecessors: list) -> list:
+    """
+    Like _path_dag_bfs() with weighted distances, returns the vertices in the order they were settled.
+    """
+    distance[source] = 0
+    sigma[source] = 1
+    order = []
+    settled = set()
+    heap = [(0, source)]
+    while heap:
+        current_distance, current = heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        order.append(current)
+        paths = sigma[current]
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            new_distance = current_distance + _checked(weights[i])
+            if distance[other] < 0 or new_distance < distance[other]:
+                distance[other] = new_distance
+                sigma[other] = paths
+                predecessors[other] = [current]
+                heappush(heap, (new_distance, other))
+            # A settled vertex (a self-loop or a tie over zero weights) already passed its paths on
+            elif new_distance == distance[other] and other not in settled and predecessors[other][-1] != current:
+                sigma[other] += paths
+                predecessors[other].append(current)
+    return order
+
+
+def _checked(weight: int | float) -> int | float:
+    """
+    Returns the weight. Raises a ValueError for negative weights, which Dijkstra's algorithm does not support.
+    """
+    if weight < 0:
+        raise ValueError("Shortest paths require non-negative edge weights.")
+    return weight
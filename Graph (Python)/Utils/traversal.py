@@ -0,0 +1,93 @@
+from array import array
+from collections import deque
+
+from Utils.BFS_state import BFSState
+from Utils.instrumentation import count_searches
+
+# The visit states are kept in a bytearray per traversal, indexed by the vertex index
+_UNSEEN = BFSState.UNSEEN.value
+_SEEN = BFSState.SEEN.value
+_VISITED = BFSState.VISITED.value
+
+
+def bfs_indices(offsets: array, neighbors: array, source: int, depth_limit: int = None):
+    """
+    Lazily traverses a compressed sparse row adjacency breadth first and yields (index, parent, depth) \
+    for every reached vertex index, starting with (source, None, 0).\
+    Vertices further than depth_limit edges away from the source are not reached.
+    """
+    count_searches()
+    state = bytearray(len(offsets) - 1)
+    state[source] = _SEEN
+    queue = deque([(source, None, 0)])
+    while queue:
+        current, parent, depth = queue.popleft()
+        yield current, parent, depth
+        state[current] = _VISITED
+        if depth_limit is not None and depth >= depth_limit:
+            continue
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+            if state[other] == _UNSEEN:
+                state[other] = _SEEN
+                queue.append((other, current, depth + 1))
+
+
+def dfs_indices(offsets: array, neighbors: array, source: int, depth_limit: int = None):
+    """
+    Lazily traverses a compressed sparse row adjacency depth first (preorder, iteratively so the \
+    recursion limit does not apply) and yields (index, parent, depth) for every reached vertex index.\
+    Vertices further than depth_limit edges away from the source along the search path are not reached.
+    """
+    count_searches()
+    state = bytearray(len(offsets) - 1)
+    state[source] = _SEEN
+    yield source, None, 0
+    # Every stack entry is a vertex with the position of the next neighbor to look at
+    stack = [(source, offsets[source], 0)]
+    while stack:
+        current, position, depth = stack[-1]
+        if position == offsets[current + 1] or (depth_limit is not None and depth >= depth_limit):
+            state[current] = _VISITED
+            stack.pop()
+            continue
+        stack[-1] = (current, position + 1, depth)
+        other = neighbors[position]
+        if state[other] == _UNSEEN:
+            state[other] = _SEEN
+            yield other, current, depth + 1
+            stack.append((other, offsets[other], depth + 1))
+
+
+def bfs(graph: object, source: object, depth_limit: int = None):
+    """
+    Lazily traverses the graph breadth first from the source vertex (object or index) \
+    and yields (vertex, parent, depth) for every reached vertex. The parent of the source is None.\
+    Stop iterating to exit early. The visit state belongs to the generator, \
+    so any number of traversals can run on the same graph at once.
+    """
+    yield from _to_vertices(graph, bfs_indices, source, depth_limit)
+
+
+def dfs(graph: object, source: object, depth_limit: int = None):
+    """
+    Lazily traverses the graph depth first from the source vertex (object or index) \
+    and yields (vertex, parent, depth) for every reached vertex in preorder. The parent of the source is None.\
+    Stop iterating to exit early. The visit state belongs to the generator, \
+    so any number of traversals can run on the same graph at once.
+    """
+    yield from _to_vertices(graph, dfs_indices, source, depth_limit)
+
+
+def _to_vertices(graph: object, traversal, source: object, depth_limit: int):
+    """
+    Runs the index traversal on the graph's adjacency and translates the indices back to vertex objects.
+    """
+    if isinstance(source, int):
+        source = graph.v(source)
+    if source is None:
+        raise KeyError("The given source index/vertex does not exist.")
+    csr = graph._csr_adjacency()
+    vertices = graph._vertices
+    for index, parent, depth in traversal(csr.offsets, csr.neighbors, source.index, depth_limit):
+        yield vertices[index], None if parent is None else vertices[parent], depth
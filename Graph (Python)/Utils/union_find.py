@@ -0,0 +1,78 @@
+from array import array
+
+
+class UnionFind:
+    """
+    Disjoint-set forest over the integers 0 to size - 1 with path compression and union by rank.\
+    find() and union() run in amortized O(α(n)) time.
+    """
+
+    # Dunder methods
+
+    def __init__(self, size: int = 0) -> None:
+
+        # The parent of every element. A root is its own parent
+        self._parent: array = array("q", range(size))
+        # An upper bound of the height of every root's tree
+        self._rank: bytearray = bytearray(size)
+        # The number of disjoint sets
+        self._set_count: int = size
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements.
+        """
+        return len(self._parent)
+
+    # Properties
+
+    @property
+    def set_count(self) -> int:
+        """
+        Returns the number of disjoint sets.
+        """
+        return self._set_count
+
+    # Instance methods
+
+    def grow(self, count: int) -> None:
+        """
+        Adds count new elements, each in a set of its own.
+        """
+        size = len(self._parent)
+        self._parent.extend(range(size, size + count))
+        self._rank.extend(bytes(count))
+        self._set_count += count
+
+    def find(self, element: int) -> int:
+        """
+        Returns the root of the element's set. Every element on the way points to its grandparent afterward.
+        """
+        parent = self._parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Merges the sets of a and b. Returns False if they already were in the same set.
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        rank = self._rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self._parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        self._set_count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        """
+        Returns True if a and b are in the same set.
+        """
+        return self.find(a) == self.find(b)
@@ -1,7 +1,8 @@
-__all__ = ("graph", "directed_graph", "vertex", "edge", "directed_edge")
+__all__ = ("graph", "directed_graph", "frozen_graph", "vertex", "edge", "directed_edge")
 
 from .graph import Graph
 from .directed_graph import DirectedGraph
+from .frozen_graph import FrozenGraph
 from .vertex import Vertex
 from .edge import Edge
 from .directed_edge import DirectedEdge
@@ -6,20 +6,21 @@ class DirectedEdge(Edge):
     Represents a directed edge in a graph.
     """
 
+    __slots__ = ("_leaves", "_to")
+
     # Dunder methods
 
     def __init__(self, vertices: tuple, weight: int | float = 1) -> None:
 
         super().__init__(vertices=vertices, weight=weight)
 
-        self._connected_to: list = list(vertices)
+        # Unlike in undirected edges, the vertices keep their (origin, destination) order
+        self.connected_to: tuple = vertices
         self._is_directed: bool = True
         self._leaves: object = vertices[0]
         self._to: object = vertices[1]
         vertices[0].add_out_edge(self)
         vertices[1].add_in_edge(self)
-        vertices[0].add_edge(self)
-        vertices[1].add_edge(self)
 
     def __str__(self) -> str:
         return f"({self._leaves}, {self._to}, {self._weight})"
@@ -37,25 +38,21 @@ def __getitem__(self, key: int) -> object | int | float:
         else:
             raise KeyError("The provided key must either be origin [0], destination [1] or weight [2].")
 
-    def __del__(self) -> None:
-        self._leaves = None
-        self._to = None
-
     # Properties
 
     @property
-    def vertices(self) -> list:
+    def vertices(self) -> tuple:
         """
-        Returns a tuple of the vertex objects that the edge is connected to.
+        Returns a tuple of the (origin, destination) vertex objects.
         """
-        return self._connected_to
+        return self.connected_to
 
     @vertices.setter
-    def vertices(self, value: object | None) -> None:
+    def vertices(self, value: tuple | None) -> None:
         """
-        Setter for self._connected_to attribute.
+        Setter for self.connected_to attribute.
         """
-        self._connected_to = value
+        self.connected_to = value
 
     @property
     def leaves(self) -> object:
@@ -3,6 +3,9 @@
 from graph import Graph
 from vertex import Vertex
 from directed_edge import DirectedEdge
+from Utils.csr import CSRAdjacency
+from Utils.cache import versioned
+from Utils import binary_format, directed
 
 
 class DirectedGraph(Graph):
@@ -10,11 +13,18 @@ class DirectedGraph(Graph):
     Provides the fundamental facilities for directed graphs.
     """
 
+    # Whether the edges have a direction. Checked against the saved files by Graph.load()
+    _directed: bool = True
+
     # Dunder methods
 
-    def __init__(self, vertices: list = None, edges: list = None) -> None:
+    def __init__(self, vertices: list = None, edges: list = None, storage: str = "dense") -> None:
+
+        # The compressed sparse row adjacency of the incoming edges (self._csr holds the outgoing ones)
+        self._csr_in: CSRAdjacency | None = None
+        self._csr_in_version: int = -1
 
-        super().__init__(vertices=vertices, edges=edges)
+        super().__init__(vertices=vertices, edges=edges, storage=storage)
 
         # Primary instance variables
         # Replacement for the Graph degree_sequence
@@ -35,35 +45,88 @@ def is_simple(self) -> bool:
         """
         return False
 
+    @property
+    @versioned
+    def strongly_connected_components(self) -> list:
+        """
+        Returns the strongly connected components as lists of vertices, \
+        in reverse topological order of the condensation. Computed once per graph version.
+        """
+        csr = self._csr_adjacency()
+        return [[self._vertices[index] for index in component] for component in
+                directed.strongly_connected_components(csr.offsets, csr.neighbors, list(self._vertices))]
+
+    @property
+    def is_strongly_connected(self) -> bool:
+        """
+        Returns True if every vertex has a path to every other vertex.
+        """
+        return len(self.strongly_connected_components) <= 1
+
+    @property
+    @versioned
+    def is_acyclic(self) -> bool:
+        """
+        Returns True if the graph has no directed cycle (self-loops included).
+        """
+        csr = self._csr_adjacency()
+        return len(directed.topological_order(csr.offsets, csr.neighbors, list(self._vertices))) == self._vertex_count
+
     # Instance methods
 
-    def edge(self, v1: int | object, v2: int | object, weight: int = 1) -> DirectedEdge:
+    def topological_sort(self) -> list:
         """
-        Creates and returns an Edge object, connecting the two given vertices.
+        Returns the vertices in an order where every edge leaves an earlier vertex.\
+        Raises a ValueError if the graph has a directed cycle.
         """
-        assert isinstance(v1, int) or isinstance(v1, Vertex), \
-            "The vertex arguments must either be vertex indices or vertex objects."
-        assert isinstance(v2, int) or isinstance(v2, Vertex), \
-            "The vertex arguments must either be vertex indices or vertex objects."
-        if isinstance(v1, int):
-            v1 = self.v(v1)
-        if isinstance(v2, int):
-            v2 = self.v(v2)
-        if v1 is None:
-            raise KeyError("The given v1 index/vertex does not exist.")
-        if v2 is None:
-            raise KeyError("The given v2 index/vertex does not exist.")
-        new_edge = DirectedEdge(vertices=tuple([v1, v2]), weight=weight)
-        self._edges.append(new_edge)
-        self._edge_count += 1
-        self._update_adj()
-        self._reset_highest_weight_len()
-        return new_edge
+        csr = self._csr_adjacency()
+        order = directed.topological_order(csr.offsets, csr.neighbors, list(self._vertices))
+        if len(order) != self._vertex_count:
+            raise ValueError("The graph has a directed cycle and no topological order.")
+        return [self._vertices[index] for index in order]
+
+    def reachable(self, origin: int | Vertex, destination: int | Vertex) -> bool:
+        """
+        Returns True if there is a directed path from the origin to the destination.
+        """
+        if isinstance(origin, int):
+            origin = self.v(origin)
+        if isinstance(destination, int):
+            destination = self.v(destination)
+        if origin is None or destination is None:
+            raise KeyError("The given origin/destination index/vertex does not exist.")
+        csr = self._csr_adjacency()
+        return directed.reachable(csr.offsets, csr.neighbors, origin.index, destination.index)
+
+    def descendants(self, vertex: int | Vertex) -> list:
+        """
+        Returns the vertices that can be reached from the given vertex along the edges.
+        """
+        if isinstance(vertex, int):
+            vertex = self.v(vertex)
+        if vertex is None:
+            raise KeyError("The given index/vertex does not exist.")
+        csr = self._csr_adjacency()
+        return [self._vertices[index] for index in directed.reached(csr.offsets, csr.neighbors, vertex.index)]
+
+    def ancestors(self, vertex: int | Vertex) -> list:
+        """
+        Returns the vertices that the given vertex can be reached from along the edges.
+        """
+        if isinstance(vertex, int):
+            vertex = self.v(vertex)
+        if vertex is None:
+            raise KeyError("The given index/vertex does not exist.")
+        csr = self._csr_in_adjacency()
+        return [self._vertices[index] for index in directed.reached(csr.offsets, csr.neighbors, vertex.index)]
 
     def e(self, v1: int | Vertex, v2: int | Vertex = None) -> list | int:
         """
-        Returns a list of all the edges connecting the two given vertices.
+        With only the v1 argument given, returns the eccentricity of the vertex (the longest directed distance \
+        to a vertex it can reach). With both arguments, returns a list of all the edges leaving v1 and entering v2.
         """
+        if v2 is None:
+            return self.eccentricity(v1)
         assert isinstance(v1, int) or isinstance(v1, Vertex), \
             "The vertex arguments must either be vertex indices or vertex objects."
         assert isinstance(v2, int) or isinstance(v2, Vertex), \
@@ -72,7 +135,9 @@ def e(self, v1: int | Vertex, v2: int | Vertex = None) -> list | int:
             v1 = self.v(v1)
         if isinstance(v2, int):
             v2 = self.v(v2)
-        return [e for e in self._edges if e.vertices == [v1, v2]]
+        if v1 is None or v2 is None:
+            return []
+        return list(self._edge_index.get(self._edge_key(v1, v2), ()))
 
     def remove_edge(self, edge: object) -> None:
         """
@@ -82,24 +147,42 @@ def remove_edge(self, edge: object) -> None:
         in which case the deletion procedure is ambiguous. 
         """
         assert isinstance(edge, DirectedEdge), "The edge argument must be an Edge instance reference."
-        self._removed_edges.append(edge)
-        self._edges.remove(edge)
+        if edge not in self._edges:
+            raise KeyError("The given edge does not exist or is already removed.")
+        self._removed_edges.add(edge)
+        del self._edges[edge]
+        self._unindex_edge(edge)
         self._edge_count -= 1
+        self._version += 1
         for vertex in edge.vertices:
-            vertex.edges.remove(edge)
+            vertex.remove_edge(edge)
+        edge.leaves.remove_out_edge(edge)
+        edge.to.remove_in_edge(edge)
+        self._count_edge(edge, -1)
+        self._edge_disconnected(edge)
         edge.vertices = None
         edge.leaves = None
         edge.to = None
-        self._update_adj()
-        self._reset_highest_weight_len()
+        self._adjacency_changed()
         del edge
 
+    def save(self, path: str) -> None:
+        """
+        Saves the graph structure (vertex slots, outgoing and incoming adjacency and weights) \
+        to a binary file that DirectedGraph.load() can map back. Vertex values are not saved, \
+        and neither are the IDs given by G.compact(): the file numbers the vertices by index.
+        """
+        binary_format.save(path, self._highest_vertex_index, self._removed_vertices, self._edge_count,
+                           self._csr_adjacency(), self._csr_in_adjacency())
+
     def incident_to(self, vertex: Vertex | int) -> list:
         """
         Returns the edges that incident to the given vertex.
         """
         if isinstance(vertex, int):
-            return self.v(vertex).in_edges
+            vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_in_adjacency().row_edges(vertex.index)
         return vertex.in_edges
 
     def deg(self, vertex: int | Vertex, count_self_loop: bool = True) -> int:
@@ -108,6 +191,9 @@ def deg(self, vertex: int | Vertex, count_self_loop: bool = True) -> int:
         """
         if isinstance(vertex, int):
             vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_adjacency().degree(vertex.index, count_self_loop) + \
+                self._csr_in_adjacency().degree(vertex.index, count_self_loop)
         return vertex.deg(count_self_loop)
 
     def incident_from(self, vertex: Vertex | int) -> list:
@@ -115,23 +201,93 @@ def incident_from(self, vertex: Vertex | int) -> list:
         Returns the edges that incident from the given vertex.
         """
         if isinstance(vertex, int):
-            return self.v(vertex).out_edges
+            vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_adjacency().row_edges(vertex.index)
         return vertex.out_edges
 
-    def incident_on(self, vertex: Vertex | int) -> None:
+    def incident_on(self, vertex: Vertex | int) -> list:
+        """
+        Returns the edges that incident from and to the given vertex.
+        """
+        if isinstance(vertex, int):
+            vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_adjacency().row_edges(vertex.index) + self._csr_in_adjacency().row_edges(vertex.index)
+        return vertex.out_edges + vertex.in_edges
+
+    def _new_edge(self, v1: Vertex, v2: Vertex, weight: int) -> DirectedEdge:
+        """
+        Creates a directed edge leaving v1 and entering v2.
+        """
+        return DirectedEdge(vertices=(v1, v2), weight=weight)
+
+    def _edge_key(self, v1: Vertex, v2: Vertex) -> tuple:
+        """
+        Returns the key of the edges leaving v1 and entering v2 in self._edge_index.
+        """
+        return v1.index, v2.index
+
+    def _edge_added(self, edge: DirectedEdge) -> None:
+        """
+        Brings the adjacency representations up to date after a single edge has been added.
+        """
+        if self._storage == "csr" or self._batch_depth:
+            self._adjacency_changed()
+            return
+        self._grow_adj_cell(edge.leaves.index, edge.to.index, edge.weight)
+
+    def _csr_in_adjacency(self) -> CSRAdjacency:
+        """
+        Returns the compressed sparse row adjacency of the incoming edges. \
+        Builds it first if the graph has changed.
+        """
+        csr = self._csr_in
+        if csr is None or self._csr_in_version != self._version:
+            version = self._version
+            csr = CSRAdjacency.from_entries(self._highest_vertex_index, self._csr_in_entries())
+            self._csr_in, self._csr_in_version = csr, version
+        return csr
+
+    def _csr_is_current(self) -> bool:
+        """
+        Whether both compressed sparse row adjacencies are built for the current version (see Graph._csr_is_current).
+        """
+        return super()._csr_is_current() and self._csr_in is not None and self._csr_in_version == self._version
+
+    def _in_snapshot(self) -> CSRAdjacency:
+        """
+        Returns the incoming adjacency for snapshots.
+        """
+        return self._csr_in_adjacency()
+
+    def _csr_entries(self):
+        """
+        Yields the (origin, destination, weight, edge) entries of the outgoing adjacency.
+        """
+        for edge in self._edges:
+            yield edge.leaves.index, edge.to.index, edge.weight, edge
+
+    def _csr_in_entries(self):
         """
-        Not Implemented.
+        Yields the (destination, origin, weight, edge) entries of the incoming adjacency.
         """
-        raise NotImplementedError()
+        for edge in self._edges:
+            yield edge.to.index, edge.leaves.index, edge.weight, edge
 
-    def _simple_bfs(self, vertex: Vertex) -> None:
+    def _adjacency_changed(self) -> None:
         """
-        Not Implemented.
+        Brings the adjacency representations up to date after an edge has been added or removed.
         """
-        raise NotImplementedError()
+        self._csr_in = None
+        super()._adjacency_changed()
 
-    def eccentricity(self, vertex: int | object) -> None:
+    def _update_adj(self) -> None:
         """
-        Not Implemented.
+        Updates self._simple_adjacency_matrix. Row i holds the weights of the edges leaving vertex i.
         """
-        raise NotImplementedError()
+        self._simple_adjacency_matrix: list = [
+            [0 for _ in range(self._highest_vertex_index)] for _ in range(self._highest_vertex_index)]
+        for edge in self._edges:
+            self._simple_adjacency_matrix[edge.leaves.index][edge.to.index] += edge.weight
+        self._mark_removed_vertices()
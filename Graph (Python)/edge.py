@@ -1,28 +1,31 @@
+from vertex import Vertex
+
+
 class Edge:
     """
     Represents an undirected edge in a graph.
     """
 
+    # Edges are stored in the millions, so they have no instance dict
+    __slots__ = ("connected_to", "_is_directed", "_weight", "_is_self_loop")
+
     # Dunder methods
 
     def __init__(self, vertices: tuple, weight: int | float = 1) -> None:
 
-        from vertex import Vertex
         assert isinstance(vertices, tuple), "Vertices must be provided in a tuple."
         assert len(vertices) == 2, "The vertex tuple must contain exactly 2 vertex objects."
         assert isinstance(vertices[0], Vertex), "Vertex 1 must be an instance if Vertex."
         assert isinstance(vertices[1], Vertex), "Vertex 2 must be an instance if Vertex."
 
-        self.connected_to: list = sorted(list(vertices))
+        # The two vertices ordered by index
+        self.connected_to: tuple = vertices if vertices[0].index <= vertices[1].index else vertices[::-1]
         self._is_directed: bool = False
         vertices[0].add_edge(self)
         vertices[1].add_edge(self)
         self._weight: int = weight
         self._is_self_loop: bool = self.connected_to[0] is self.connected_to[1]
 
-        # Aliases
-        self.incident_on = self.connected_to
-
     def __str__(self) -> str:
         """
         Returns the string representation of the edge object.
@@ -35,22 +38,22 @@ def __repr__(self) -> str:
         """
         return self.__str__()
 
-    def __del__(self) -> None:
-        """
-        Deletes the edge object.\
-        The edge and vertex connection information deletion gets handled by the graph class.
-        """
-        self._weight = None
-
     # Properties
 
     @property
-    def vertices(self) -> list:
+    def vertices(self) -> tuple:
         """
         Returns a tuple of the vertex objects that the edge is connected to.
         """
         return self.connected_to
 
+    @property
+    def incident_on(self) -> tuple:
+        """
+        Alias of self.vertices.
+        """
+        return self.connected_to
+
     @property
     def weight(self) -> int | float:
         """
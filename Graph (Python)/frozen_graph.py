@@ -0,0 +1,287 @@
+from array import array
+
+from Utils.csr import CSRAdjacency
+from Utils.union_find import UnionFind
+from Utils import bitset_bfs, distance_bounds, shortest_paths, traversal
+
+
+class FrozenGraph:
+    """
+    Immutable snapshot of a graph's structure at one version, created by G.freeze().\
+    The snapshot shares the compressed sparse row arrays of the graph (they are never modified, \
+    a mutation of the graph builds new ones), so creating it is cheap and any number of threads \
+    can read it without locks while the graph keeps changing. Vertices are addressed by index, \
+    vertex values and edge objects are not part of the snapshot.
+    """
+
+    # Dunder methods
+
+    def __init__(self, version: int, present: bytes, edge_count: int, csr: CSRAdjacency,
+                 in_csr: CSRAdjacency | None = None) -> None:
+
+        # The graph version the snapshot was taken at
+        self._version: int = version
+        # One byte per vertex index, 1 for present and 0 for removed vertices
+        self._present: bytes = present
+        self._vertex_count: int = sum(present)
+        self._edge_count: int = edge_count
+        # The (outgoing) adjacency and, for directed graphs, the incoming one
+        self._csr: CSRAdjacency = csr
+        self._in_csr: CSRAdjacency | None = in_csr
+        # Lazily computed metrics. Concurrent readers may compute one twice, which is harmless
+        self._eccentricities: dict | None = None
+        self._radius: int | None = None
+        self._diameter: int | None = None
+        # The component root of every vertex index
+        self._component_labels: array | None = None
+
+    def __len__(self) -> int:
+        return self._vertex_count
+
+    def __contains__(self, index: int) -> bool:
+        return self.has_vertex(index)
+
+    def __repr__(self) -> str:
+        return f"FrozenGraph(version={self._version}, vertices={self._vertex_count}, edges={self._edge_count})"
+
+    # Properties
+
+    @property
+    def version(self) -> int:
+        """
+        Returns the version of the graph the snapshot was taken at.
+        """
+        return self._version
+
+    @property
+    def directed(self) -> bool:
+        """
+        Whether the snapshot is of a directed graph.
+        """
+        return self._in_csr is not None
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        Returns the number of vertices.
+        """
+        return self._vertex_count
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Returns the number of edges.
+        """
+        return self._edge_count
+
+    @property
+    def vertices(self) -> list:
+        """
+        Returns the indices of the vertices.
+        """
+        present = self._present
+        return [index for index in range(len(present)) if present[index]]
+
+    @property
+    def radius(self) -> int:
+        """
+        Returns the minimum eccentricity (see G.radius).
+        """
+        if self._radius is None:
+            if self._in_csr is None:
+                self._radius = distance_bounds.radius_and_center(
+                    self._csr.offsets, self._csr.neighbors, self._component_indices())[0]
+            else:
+                eccentricities = self._all_eccentricities()
+                self._radius = min(eccentricities.values()) if eccentricities else 0
+        return self._radius
+
+    @property
+    def diameter(self) -> int:
+        """
+        Returns the maximum eccentricity (see G.diameter).
+        """
+        if self._diameter is None:
+            if self._in_csr is None:
+                self._diameter = distance_bounds.diameter(self._csr.offsets, self._csr.neighbors,
+                                                          self._component_indices())
+            else:
+                eccentricities = self._all_eccentricities()
+                self._diameter = max(eccentricities.values()) if eccentricities else 0
+        return self._diameter
+
+    @property
+    def component_count(self) -> int:
+        """
+        Returns the number of connected components (ignoring the edge directions in directed graphs).
+        """
+        labels = self._components()
+        present = self._present
+        return len({labels[index] for index in range(len(present)) if present[index]})
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Whether every vertex has a path to every other vertex (ignoring the edge directions in directed graphs).
+        """
+        return self.component_count <= 1
+
+    # Instance methods
+
+    def has_vertex(self, index: int) -> bool:
+        """
+        Whether the vertex with the given index is present in the snapshot.
+        """
+        return isinstance(index, int) and 0 <= index < len(self._present) and self._present[index] == 1
+
+    def deg(self, index: int, count_self_loop: bool = True) -> int:
+        """
+        Returns the degree of the vertex, the sum of the out and in degree in directed graphs.
+        """
+        self._check(index)
+        deg = self._csr.degree(index, count_self_loop)
+        if self._in_csr is not None:
+            deg += self._in_csr.degree(index, count_self_loop)
+        return deg
+
+    def neighbors(self, index: int) -> list:
+        """
+        Returns the indices of the vertices the edges of the vertex lead to (one per edge).
+        """
+        self._check(index)
+        return self._csr.row(index).tolist()
+
+    def weights(self, index: int) -> list:
+        """
+        Returns the weights of the edges in the order of self.neighbors(index).
+        """
+        self._check(index)
+        return self._csr.row_weights(index).tolist()
+
+    def in_neighbors(self, index: int) -> list:
+        """
+        Returns the indices of the vertices whose edges enter the vertex (the neighbors in undirected graphs).
+        """
+        self._check(index)
+        return (self._csr if self._in_csr is None else self._in_csr).row(index).tolist()
+
+    def is_adjacent(self, v1: int, v2: int) -> bool:
+        """
+        Whether an edge leads from v1 to v2.
+        """
+        self._check(v1)
+        return v2 in self._csr.row(v1)
+
+    def bfs(self, source: int, depth_limit: int = None):
+        """
+        Lazily traverses the snapshot breadth first and yields (index, parent, depth) for every reached vertex.
+        """
+        self._check(source)
+        return traversal.bfs_indices(self._csr.offsets, self._csr.neighbors, source, depth_limit)
+
+    def dfs(self, source: int, depth_limit: int = None):
+        """
+        Lazily traverses the snapshot depth first and yields (index, parent, depth) for every reached vertex.
+        """
+        self._check(source)
+        return traversal.dfs_indices(self._csr.offsets, self._csr.neighbors, source, depth_limit)
+
+    def hop_distances(self, source: int) -> list:
+        """
+        Returns the number of edges on the shortest path from the source to every vertex index \
+        (0 for unreachable vertices), like a row of G.distance_matrix.
+        """
+        distance = [0] * len(self._present)
+        for index, _, depth in self.bfs(source):
+            distance[index] = depth
+        return distance
+
+    def eccentricity(self, index: int) -> int:
+        """
+        Returns the longest of the shortest (unweighted) distances from the vertex to the vertices it reaches.
+        """
+        self._check(index)
+        return self._all_eccentricities()[index]
+
+    def d(self, origin: int, destination: int) -> int | float:
+        """
+        Returns the weighted shortest distance between the two vertices, 0 if the destination is not reachable.
+        """
+        distance, _ = self.shortest_path(origin, destination)
+        return 0 if distance is None else distance
+
+    def shortest_path(self, origin: int, destination: int) -> tuple:
+        """
+        Returns (distance, path) for the shortest weighted path with the path as a list of vertex indices, \
+        or (None, []) if the destination is not reachable.
+        """
+        self._check(origin)
+        self._check(destination)
+        in_csr = self._csr if self._in_csr is None else self._in_csr
+        return shortest_paths.bidirectional_dijkstra(
+            (self._csr.offsets, self._csr.neighbors, self._csr.weights),
+            (in_csr.offsets, in_csr.neighbors, in_csr.weights), origin, destination)
+
+    def dijkstra(self, source: int) -> dict:
+        """
+        Returns the weighted shortest distance from the source to every reachable vertex index.
+        """
+        self._check(source)
+        distances, _ = shortest_paths.dijkstra(self._csr.offsets, self._csr.neighbors, self._csr.weights, source)
+        return distances
+
+    def connected(self, v1: int, v2: int) -> bool:
+        """
+        Whether there is a path between the two vertices (ignoring the edge directions in directed graphs).
+        """
+        self._check(v1)
+        self._check(v2)
+        labels = self._components()
+        return labels[v1] == labels[v2]
+
+    def _check(self, index: int) -> None:
+        """
+        Raises a KeyError if the vertex index is not present in the snapshot.
+        """
+        if not self.has_vertex(index):
+            raise KeyError("The given vertex index does not exist in the snapshot.")
+
+    def _all_eccentricities(self) -> dict:
+        """
+        Returns the eccentricity of every vertex by index. Computed on first use.
+        """
+        eccentricities = self._eccentricities
+        if eccentricities is None:
+            vertices = self.vertices
+            eccentricities = dict(zip(vertices, bitset_bfs.eccentricities(
+                self._csr.offsets, self._csr.neighbors, vertices)))
+            self._eccentricities = eccentricities
+        return eccentricities
+
+    def _component_indices(self) -> list:
+        """
+        Returns the connected components as lists of vertex indices.
+        """
+        labels = self._components()
+        components = {}
+        for index in self.vertices:
+            components.setdefault(labels[index], []).append(index)
+        return list(components.values())
+
+    def _components(self) -> array:
+        """
+        Returns the component label (root) of every vertex index. Built on first use from a disjoint-set index \
+        that is then thrown away, so the readers never modify shared state.
+        """
+        labels = self._component_labels
+        if labels is None:
+            offsets = self._csr.offsets
+            neighbors = self._csr.neighbors
+            size = len(self._present)
+            union_find = UnionFind(size)
+            for row in range(size):
+                for i in range(offsets[row], offsets[row + 1]):
+                    union_find.union(row, neighbors[i])
+            labels = array("q", (union_find.find(index) for index in range(size)))
+            self._component_labels = labels
+        return labels
@@ -1,5 +1,15 @@
+from array import array
+from contextlib import contextmanager
+
 from edge import Edge
 from vertex import Vertex
+from Utils.csr import CSRAdjacency
+from Utils.cache import VersionedCache, versioned
+from Utils.parallel import MIN_PARALLEL_SOURCES, all_pairs_distances
+from Utils.union_find import UnionFind
+from frozen_graph import FrozenGraph
+from Utils import (binary_format, bitset_bfs, centrality, distance_bounds, edge_formats, instrumentation, interop,
+                   landmarks, shortest_paths, traversal)
 
 
 class Graph:
@@ -7,10 +17,15 @@ class Graph:
     Provides the fundamental facilities for undirected graphs.
     """
 
+    # Whether the edges have a direction. Checked against the saved files by Graph.load()
+    _directed: bool = False
+
     # Dunder methods
 
-    def __init__(self, vertices: list = None, edges: list = None) -> None:
+    def __init__(self, vertices: list = None, edges: list = None, storage: str = "dense") -> None:
 
+        assert storage in ("dense", "csr"), \
+            "The storage must either be 'dense' or 'csr'."
         if vertices:
             assert isinstance(vertices, list), \
                 "The vertices must be provided in a set."
@@ -22,12 +37,14 @@ def __init__(self, vertices: list = None, edges: list = None) -> None:
                 "The edges must be provided in a list of tuples, each with 3 integers at most."
 
         # Primary instance variables
-        # The vertex list containing vertex objects
-        self._vertices: list = list()
-        # The edge set / binary relation containing edge objects
-        self._edges: list = list()
-        # The number of vertices
-        self._vertex_count: int = len(vertices) if vertices else 0
+        # The vertex table mapping each vertex index to its vertex object
+        self._vertices: dict = dict()
+        # The edge set / binary relation containing edge objects. Kept as the keys of an insertion ordered dict
+        self._edges: dict = dict()
+        # The edge multimap from the endpoint index pair (see self._edge_key) to the list of connecting edges
+        self._edge_index: dict = dict()
+        # The number of vertices (removed vertices excluded)
+        self._vertex_count: int = 0
         # The number of edges
         self._edge_count: int = 0
         # The reverse sorted degree sequence
@@ -61,52 +78,89 @@ def __init__(self, vertices: list = None, edges: list = None) -> None:
         # Whether every vertex in the graph has a degree of 3 except for one that has the degree v - 1
         self._is_wheel: bool = False
 
+        # Structural counters, maintained by every edge and vertex mutation
+        # The number of edges with a weight other than 1
+        self._non_unit_weight_count: int = 0
+        # The number of self-loop edges
+        self._self_loop_count: int = 0
+        # The number of edges that are parallel to an earlier edge between the same vertices
+        self._parallel_edge_count: int = 0
+        # The isolated and pendent vertices (without counting self-loops), kept as the keys of dicts
+        self._isolated: dict = dict()
+        self._pendent: dict = dict()
+
         # Matrix representation attributes
-        self._simple_adjacency_matrix: list = \
-            [[0 for _ in range(self._vertex_count)] for _ in range(self._vertex_count)]
-        self._distance_matrix: list = \
-            [[0 for _ in range(self._vertex_count)] for _ in range(self._vertex_count)]
+        # The storage backend: "dense" keeps the matrices up to date, \
+        # "csr" keeps a compressed sparse row index and builds the matrices only on request
+        self._storage: str = storage
+        self._simple_adjacency_matrix: list = []
+        self._distance_matrix: list = []
+        # The compressed sparse row adjacency and the graph version it was built for. Rebuilt lazily after mutations
+        self._csr: CSRAdjacency | None = None
+        self._csr_version: int = -1
+        # The number of processes that compute the distance matrix. 1 computes it in the calling process
+        self._workers: int = 1
+        # The disjoint-set index of the connected components by vertex index, updated by every new edge.\
+        # Set to None when an edge removal may have split a component and rebuilt on the next query
+        self._union_find: UnionFind | None = UnionFind()
+        # The settings of self.build_landmarks() (None without a landmark index) and the index last built
+        self._landmark_options: dict | None = None
+        self._landmarks: landmarks.LandmarkIndex | None = None
 
         # Miscellaneous
         # The main string representation for str() and print()
         self._representation: str = ""
-        # The highest index created in the graph. Saved so the vertex deletions won't mess up new vertices
-        self._highest_vertex_index: int = self._vertex_count
-        # The removed vertices are saved here so any reference to them would not work
-        self._removed_vertices: list = []
+        # The highest index created in the graph. Saved so the vertex deletions won't mess up new vertices.\
+        # The matrices have this many rows and columns
+        self._highest_vertex_index: int = 0
+        # The indices of the removed vertices are saved here so any reference to them would not work
+        self._removed_vertices: set = set()
+        # The stable ID of the vertex in every slot (index), set by the first self.compact(). \
+        # Until then the ID of a vertex is its index
+        self._slot_ids: array | None = None
+        # The vertices by ID, set along with self._slot_ids
+        self._id_map: dict | None = None
+        # The ID of the next new vertex. IDs are never reused
+        self._next_id: int = 0
+        # The share of removed vertex slots at which the graph compacts itself (None never does)
+        self._compaction_threshold: float | None = None
         # The removed edges are saved here so any reference to them would not work
-        self._removed_edges: list = []
+        self._removed_edges: set = set()
         # For use in representation
         self._highest_weight_len: int = 1
+        # Incremented on every mutation of the vertex or edge set. The cached metrics are valid for one version
+        self._version: int = 0
+        # The metrics computed for the current version (see Utils.cache.versioned)
+        self._cache: VersionedCache = VersionedCache()
+        # The number of open self.batch() blocks. The derived state is only maintained outside of them
+        self._batch_depth: int = 0
+        # Whether a mutation inside the current batch left the derived state out of date
+        self._batch_pending: bool = False
+        # The call counts and timings collected while the graph is instrumented (see self.instrument())
+        self._instrumentation: instrumentation.Instrumentation | None = None
 
         # Initializations
         # Create and add the vertex references
         if vertices is not None:
-            for v in vertices:
-                self._vertices.append(Vertex(v))
+            self.add_vertices_from(len(vertices))
         # Create and add the edge references
         if edges is not None:
-            for e in edges:
-                if len(e) == 2:  # No weight is given, defaults to 1
-                    self.edge(e[0], e[1])
-                elif len(e) == 3:  # The weight is provided
-                    self.edge(e[0], e[1], e[2])
-                else:
-                    raise KeyError(
-                        "The given edge must be provided as a tuple of 2 or 3 values e.g. (vertex, vertex[, weight])")
-            self._reset_highest_weight_len()
+            self.add_edges_from(edges)
 
     def __str__(self) -> str:
         """
         The main string representation for str() and print().
         """
+        if self._storage == "csr" or self._batch_pending:
+            self._update_adj()
+            self._reset_highest_weight_len()
         self._representation = ""
-        for i in range(self._vertex_count):
-            for j in range(self._vertex_count):
+        for i in range(self._highest_vertex_index):
+            for j in range(self._highest_vertex_index):
                 current_element = str(self._simple_adjacency_matrix[i][j])
                 self._representation += " " * (self._highest_weight_len - len(current_element)) + current_element
                 self._representation += " "
-            self._representation += "\n" if i != self._vertex_count - 1 else ""
+            self._representation += "\n" if i != self._highest_vertex_index - 1 else ""
         return str(self._representation)
 
     def __repr__(self) -> str:
@@ -114,8 +168,10 @@ def __repr__(self) -> str:
 
     def __getitem__(self, index: int) -> list:
         """
-        Returns the vertex with the given index.
+        Returns the vertex with the given index (ID after G.compact()).
         """
+        if self._id_map is not None:
+            return self._id_map[index]
         return self._vertices[index]
 
     # Properties
@@ -125,14 +181,14 @@ def vertices(self) -> list:
         """
         Returns a list of all vertices in the graph.
         """
-        return self._vertices
+        return list(self._vertices.values())
 
     @property
     def edges(self) -> list:
         """
         Returns a list of all edges in the graph.
         """
-        return self._edges
+        return list(self._edges)
 
     @property
     def vertex_count(self) -> int:
@@ -149,25 +205,43 @@ def edge_count(self) -> int:
         return self._edge_count
 
     @property
+    def version(self) -> int:
+        """
+        Returns the mutation counter of the graph. It changes whenever a vertex or an edge is added or removed.
+        """
+        return self._version
+
+    @property
+    def cache_stats(self) -> dict:
+        """
+        Returns the hit and miss counts of the metric cache.
+        """
+        return self._cache.stats
+
+    @property
+    @versioned
     def degree_sequence(self) -> list:
         """
-        Updates and returns the degree sequence of the graph.
+        Updates and returns the degree sequence of the graph. Computed once per graph version.
         """
         self._degree_sequence = []
-        for vertex in self._vertices:
+        for vertex in self._vertices.values():
             self._degree_sequence.append(self.deg(vertex))
         self._degree_sequence.sort(reverse=True)
         return self._degree_sequence
 
     @property
+    @versioned
     def radius(self) -> int:
         """
-        Returns the radius of the graph.
+        Returns the radius of the graph.\
+        Undirected graphs use the bounding eccentricities algorithm, which usually needs only a few \
+        breadth first searches instead of one per vertex.
         """
-        e = []
-        for vertex in self._vertices:
-            e.append(self.eccentricity(vertex))
-        self._radius = min(e)
+        if self._directed:
+            self._radius = min(self._eccentricities())
+        else:
+            self._radius = self._radius_and_center()[0]
         return self._radius
 
     @property
@@ -178,23 +252,32 @@ def r(self) -> int:
         return self.radius
 
     @property
+    @versioned
     def diameter(self) -> int:
         """
-        Returns the diameter of the graph.
+        Returns the diameter of the graph.\
+        Undirected graphs use the bounding eccentricities algorithm (see the radius property).
         """
-        e = []
-        for vertex in self._vertices:
-            e.append(self.eccentricity(vertex))
-        self._diameter = max(e)
+        if self._directed:
+            self._diameter = max(self._eccentricities())
+        else:
+            csr = self._csr_adjacency()
+            self._diameter = distance_bounds.diameter(csr.offsets, csr.neighbors, self._component_indices())
         return self._diameter
 
     @property
+    @versioned
     def central(self) -> list:
         """
         Returns a list of all central vertices of the graph.\
         A central vertex's eccentricity is equal to the radius of the graph.
         """
-        self._central = [vertex for vertex in self._vertices if self.eccentricity(vertex) == self._radius]
+        if self._directed:
+            radius = self.radius
+            self._central = [vertex for vertex, e in zip(self._vertices.values(), self._eccentricities())
+                             if e == radius]
+        else:
+            self._central = [self._vertices[index] for index in self._radius_and_center()[1]]
         return self._central
 
     @property
@@ -223,11 +306,7 @@ def is_weighted(self) -> bool:
         """
         Returns True if the graph is weighted (there are different weights than 1).
         """
-        self._is_weighted = False
-        for edge in self._edges:
-            if edge.weight != 1:
-                self._is_weighted = True
-                break
+        self._is_weighted = self._non_unit_weight_count > 0
         return self._is_weighted
 
     @property
@@ -237,7 +316,7 @@ def is_complete(self) -> bool:
         """
         self._is_complete = True
         ds = self.degree_sequence
-        for i, vertex in enumerate(self._vertices):
+        for i, vertex in enumerate(self._vertices.values()):
             if not (ds[i] == self._vertex_count - 1 and not self.loop(vertex)):
                 self._is_complete = False
                 break
@@ -248,9 +327,7 @@ def has_pendent(self) -> bool:
         """
         Returns True if the graph has at least one pendent vertex.
         """
-        self._has_pendent = False
-        if len(self.pendent) > 0:
-            self._has_pendent = True
+        self._has_pendent = len(self._pendent) > 0
         return self._has_pendent
 
     @property
@@ -258,9 +335,7 @@ def has_isolated(self) -> bool:
         """
         Returns True if the graph has at least one isolated vertex.
         """
-        self._has_isolated = False
-        if len(self.isolated) > 0:
-            self._has_isolated = True
+        self._has_isolated = len(self._isolated) > 0
         return self._has_isolated
 
     @property
@@ -269,20 +344,7 @@ def is_multigraph(self) -> bool:
         Returns True if the graph is a multigraph.\
         A multigraph has more than one edge between two vertices.
         """
-        self._is_multigraph = False
-        for vertex in self._vertices:
-            if vertex.edges == []:
-                continue
-            vertex_list = []
-            for edge in vertex.edges:
-                if edge.vertices[0] != vertex:
-                    vertex_list.append(edge.vertices[0])
-                else:
-                    vertex_list.append(edge.vertices[1])
-            for v in vertex_list:
-                if vertex_list.count(v) > 1:
-                    self._is_multigraph = True
-                    break
+        self._is_multigraph = self._parallel_edge_count > 0
         return self._is_multigraph
 
     @property
@@ -290,26 +352,26 @@ def has_self_loop(self) -> bool:
         """
         Whether the graph has at least one self loop.
         """
-        self._has_self_loop = False
-        for edge in self._edges:
-            if edge.is_self_loop:
-                self._has_self_loop = True
-                break
+        self._has_self_loop = self._self_loop_count > 0
         return self._has_self_loop
 
     @property
     def is_connected(self) -> bool:
         """
-        Whether the graph is connected (every vertex has a path to every other vertex).
+        Whether the graph is connected (every vertex has a path to every other vertex).\
+        The edge directions are ignored in directed graphs.
         """
-        self._is_connected = True
-        for i, row in enumerate(self.distance_matrix):
-            for distance in row:
-                if row.index(distance) != i and distance == 0:
-                    self._is_connected = False
-                    return self._is_connected
+        self._is_connected = self.component_count <= 1
         return self._is_connected
 
+    @property
+    def component_count(self) -> int:
+        """
+        Returns the number of connected components. Every isolated vertex is a component of its own.
+        """
+        # The removed vertices stay in the index as singleton sets
+        return self._components_index().set_count - len(self._removed_vertices)
+
     @property
     def is_wheel(self) -> bool:
         """
@@ -338,15 +400,70 @@ def M(self) -> list:
         self._update_adj()
         return self._simple_adjacency_matrix
 
+    @property
+    def storage(self) -> str:
+        """
+        Returns the storage backend of the graph ("dense" or "csr").
+        """
+        return self._storage
+
+    @property
+    def workers(self) -> int:
+        """
+        Returns the number of processes that compute the distance matrix.
+        """
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers: int) -> None:
+        """
+        Sets the number of processes that compute the distance matrix. \
+        With more than 1, the multi-source searches are split between the processes of a pool \
+        once the graph has Utils.parallel.MIN_PARALLEL_SOURCES vertices, smaller graphs are not worth starting it.
+        """
+        assert isinstance(workers, int) and workers >= 1, "The number of workers must be a positive integer."
+        self._workers = workers
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """
+        Returns the share of vertex slots (rows of the matrices) that belong to removed vertices.
+        """
+        return len(self._removed_vertices) / self._highest_vertex_index if self._highest_vertex_index else 0.0
+
+    @property
+    def compaction_threshold(self) -> float | None:
+        """
+        Returns the tombstone ratio at which the graph compacts itself after a vertex removal or batch, \
+        None if it never does.
+        """
+        return self._compaction_threshold
+
+    @compaction_threshold.setter
+    def compaction_threshold(self, threshold: float | None) -> None:
+        """
+        Sets the tombstone ratio at which the graph compacts itself (see self.compact()), None to turn it off.
+        """
+        assert threshold is None or 0 < threshold <= 1, "The compaction threshold must be in (0, 1] or None."
+        self._compaction_threshold = threshold
+        self._compact_if_due()
+
     @property
     def distance_matrix(self) -> list:
         """
         Updates and returns the distance matrix.
         """
         if self.is_simple:
-            for vertex in self._vertices:
-                for i, element in enumerate(self._simple_bfs(vertex)):
-                    self._distance_matrix[vertex.index][i] = element
+            if self._storage == "csr":
+                self._distance_matrix = \
+                    [[0 for _ in range(self._highest_vertex_index)] for _ in range(self._highest_vertex_index)]
+            csr = self._csr_adjacency()
+            if self._workers > 1 and self._vertex_count >= MIN_PARALLEL_SOURCES:
+                rows = all_pairs_distances(csr.offsets, csr.neighbors, list(self._vertices), self._workers)
+            else:
+                rows = bitset_bfs.distance_rows(csr.offsets, csr.neighbors, list(self._vertices))
+            for index in self._vertices:
+                self._distance_matrix[index] = rows[index]
             return self._distance_matrix
 
     @property
@@ -354,14 +471,14 @@ def isolated(self) -> list:
         """
         Returns a list of all isolated vertices.
         """
-        return [vertex for vertex in self._vertices if vertex.is_isolated]
+        return sorted(self._isolated)
 
     @property
     def pendent(self) -> list:
         """
         Returns a list of all pendent vertices.
         """
-        return [vertex for vertex in self._vertices if vertex.is_pendent]
+        return sorted(self._pendent)
 
     # Instance methods
 
@@ -371,53 +488,95 @@ def vertex(self, value: object = None) -> object:
         """
         new_vertex = Vertex(index=self._highest_vertex_index, value=value)
         self._highest_vertex_index += 1
-        self._vertices.append(new_vertex)
-        self._simple_adjacency_matrix.append([0 for _ in range(self._vertex_count)])
-        for row in self._simple_adjacency_matrix:
-            row.extend([0])
-        self._distance_matrix.append([0 for _ in range(self._vertex_count)])
-        for row in self._distance_matrix:
-            row.extend([0])
+        self._vertices[new_vertex.index] = new_vertex
+        self._assign_ids((new_vertex,))
+        self._isolated[new_vertex] = None
+        if self._union_find is not None:
+            self._union_find.grow(1)
+        self._version += 1
+        if self._storage == "dense" and not self._batch_depth:
+            self._grow_matrices(1)
+        else:
+            self._adjacency_changed()
         self._vertex_count += 1
         return new_vertex
 
+    def add_vertices_from(self, count: int) -> list:
+        """
+        Creates count new isolated vertices at once and returns them in a list.\
+        The matrices are grown a single time for the whole batch.
+        """
+        assert isinstance(count, int) and count >= 0, "The count must be a non-negative integer."
+        new_vertices = [Vertex(index=self._highest_vertex_index + i) for i in range(count)]
+        self._highest_vertex_index += count
+        self._vertices.update((vertex.index, vertex) for vertex in new_vertices)
+        self._assign_ids(new_vertices)
+        self._isolated.update((vertex, None) for vertex in new_vertices)
+        if self._union_find is not None:
+            self._union_find.grow(count)
+        self._version += 1
+        if self._storage == "dense" and not self._batch_depth:
+            self._grow_matrices(count)
+        else:
+            self._adjacency_changed()
+        self._vertex_count += count
+        return new_vertices
+
     def v(self, index: int) -> Vertex | None:
         """
-        Returns the vertex with the index if it exists. Else returns None.
+        Returns the vertex with the index if it exists. Else returns None.\
+        After G.compact() the index is the vertex's stable ID (see G.vertex_id()).
         """
+        if self._id_map is not None:
+            vertex = self._id_map.get(index)
+            # IDs are handed out in order and never reused, so a missing lower one belonged to a removed vertex
+            if vertex is None and isinstance(index, int) and 0 <= index < self._next_id:
+                raise KeyError("The requested vertex is removed.")
+            return vertex
         if index in self._removed_vertices:
             raise KeyError("The requested vertex is removed.")
-        for v in self._vertices:
-            if v.index == index:
-                return v
-        return None  # In case the vertex with the given index is not present
+        return self._vertices.get(index)  # None in case the vertex with the given index is not present
+
+    def vertex_id(self, vertex: Vertex) -> int:
+        """
+        Returns the stable ID of the vertex, which G.v() and every method taking vertex indices accept.\
+        The ID equals vertex.index until the first G.compact() renumbers the indices, the IDs never change.
+        """
+        assert isinstance(vertex, Vertex), "The vertex argument must be a Vertex instance reference."
+        if self._slot_ids is None:
+            return vertex.index
+        return self._slot_ids[vertex.index]
 
     def remove_vertex(self, vertex: int | Vertex) -> None:
         """
         Deletes the given vertex reference. Removes all the edges that are connected to it as well. \
         Removing a vertex does not shift the remaining vertices' index and adding new vertices \
-        afterward will yield higher index values than the all-time highest.\
+        afterward will yield higher index values than the all-time highest. The slots of removed vertices \
+        are reclaimed by G.compact().\
         The vertex will exist but inaccessible to the user.\
         It is not recommended to access and modify the removed vertex.
         """
         if isinstance(vertex, int):
             vertex = self.v(vertex)
-        if vertex in self._vertices and vertex not in self._removed_vertices:
-            # Remove edges to the vertex
-            for _ in range(len(vertex.edges)):
-                self.remove_edge(vertex.edges[0])
-            # Remove the vertex from the graph
-            deleting_vertex_index = vertex.index
-            self._removed_vertices.append(deleting_vertex_index)
-            self._edge_count -= len(vertex.edges)
-            self._vertices.remove(vertex)
-            self._simple_adjacency_matrix[deleting_vertex_index] = [
-                -1 for _ in range(self._vertex_count)]
-            for row in self._simple_adjacency_matrix:
-                row[deleting_vertex_index] = -1
+        if vertex is not None and self._vertices.get(vertex.index) is vertex:
+            # The matrices are rebuilt once for all removed edges (and marked with -1 for the vertex)
+            with self.batch():
+                # Remove edges to the vertex
+                while vertex.edges:
+                    self.remove_edge(vertex.edges[0])
+                # Remove the vertex from the graph
+                deleting_vertex_index = vertex.index
+                self._removed_vertices.add(deleting_vertex_index)
+                if self._id_map is not None:
+                    del self._id_map[self._slot_ids[deleting_vertex_index]]
+                self._edge_count -= len(vertex.edges)
+                del self._vertices[deleting_vertex_index]
+                self._isolated.pop(vertex, None)
+                self._union_find = None
+                self._vertex_count -= 1
+                self._version += 1
+                self._adjacency_changed()
             del vertex
-            # Reset self._highest_weight_len
-            self._reset_highest_weight_len()
         else:
             raise KeyError("The given vertex does not exist or is already removed.")
 
@@ -425,25 +584,32 @@ def edge(self, v1: int | object, v2: int | object, weight: int = 1) -> object:
         """
         Creates and returns an Edge object, connecting the two given vertices.
         """
-        assert isinstance(v1, int) or isinstance(v1, Vertex), \
-            "The vertex arguments must either be vertex indices or vertex objects."
-        assert isinstance(v2, int) or isinstance(v2, Vertex), \
-            "The vertex arguments must either be vertex indices or vertex objects."
-        if isinstance(v1, int):
-            v1 = self.v(v1)
-        if isinstance(v2, int):
-            v2 = self.v(v2)
-        if v1 is None:
-            raise KeyError("The given v1 index/vertex does not exist.")
-        if v2 is None:
-            raise KeyError("The given v2 index/vertex does not exist.")
-        new_edge = Edge(vertices=tuple([v1, v2]), weight=weight)
-        self._edges.append(new_edge)
-        self._edge_count += 1
-        self._update_adj()
-        self._reset_highest_weight_len()
+        new_edge = self._add_edge(v1, v2, weight)
+        self._edge_added(new_edge)
         return new_edge
 
+    def add_edges_from(self, edges) -> list:
+        """
+        Creates an edge for every (vertex, vertex[, weight]) tuple in the given iterable and returns them in a list.\
+        The iterable may be a generator so large edge lists can be streamed in. \
+        The adjacency representations are brought up to date a single time for the whole batch.
+        """
+        new_edges = []
+        try:
+            for e in edges:
+                if len(e) == 2:  # No weight is given, defaults to 1
+                    new_edges.append(self._add_edge(e[0], e[1]))
+                elif len(e) == 3:  # The weight is provided
+                    new_edges.append(self._add_edge(e[0], e[1], e[2]))
+                else:
+                    raise KeyError(
+                        "The given edge must be provided as a tuple of 2 or 3 values e.g. (vertex, vertex[, weight])")
+        finally:
+            # The edges created before a failure stay in the graph and must be reflected
+            if new_edges:
+                self._adjacency_changed()
+        return new_edges
+
     def e(self, v1: int | object, v2: int | object = None) -> list | int:
         """
         With only the v1 argument given, returns the eccentricity of the vertex.
@@ -459,8 +625,9 @@ def e(self, v1: int | object, v2: int | object = None) -> list | int:
             v1 = self.v(v1)
         if isinstance(v2, int):
             v2 = self.v(v2)
-        return [e for e in self._edges if
-                not (not (e not in self._removed_edges) or not (e.vertices == [v1, v2] or e.vertices == [v2, v1]))]
+        if v1 is None or v2 is None:
+            return []
+        return list(self._edge_index.get(self._edge_key(v1, v2), ()))
 
     def remove_edge(self, edge: object) -> None:
         """
@@ -471,16 +638,209 @@ def remove_edge(self, edge: object) -> None:
         """
         assert isinstance(edge, Edge), \
             "The edge argument must be an Edge instance reference."
-        self._removed_edges.append(edge)
-        self._edges.remove(edge)
+        if edge not in self._edges:
+            raise KeyError("The given edge does not exist or is already removed.")
+        self._removed_edges.add(edge)
+        del self._edges[edge]
+        self._unindex_edge(edge)
         self._edge_count -= 1
+        self._version += 1
         for vertex in edge.connected_to:
-            vertex.edges.remove(edge)
+            vertex.remove_edge(edge)
+        self._count_edge(edge, -1)
+        self._edge_disconnected(edge)
         edge.connected_to = None
-        self._update_adj()
-        self._reset_highest_weight_len()
+        self._adjacency_changed()
         del edge
 
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that defers the maintenance of the derived state (adjacency and distance matrices, \
+        compressed sparse row index and representation bookkeeping) until the block exits, \
+        e.g. with G.batch(): ...\
+        Vertices and edges added or removed inside the block are visible to G.v() and G.e() right away. \
+        Batches can be nested, the derived state is brought up to date once the outermost one exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_pending:
+                self._batch_pending = False
+                if self._storage == "dense" and len(self._distance_matrix) != self._highest_vertex_index:
+                    self._distance_matrix = \
+                        [[0 for _ in range(self._highest_vertex_index)] for _ in range(self._highest_vertex_index)]
+                self._adjacency_changed()
+            self._compact_if_due()
+
+    def compact(self) -> int:
+        """
+        Reclaims the slots of the removed vertices and returns their number. The remaining vertices are \
+        renumbered 0 .. n - 1 in their order, and the matrices, indices and cached metrics are rebuilt at the \
+        new size, so long running graphs with many removals stop growing and traversals stop paying for dead slots.\
+        The vertices keep their IDs: G.v(), G[...] and every method taking vertex indices accept the indices \
+        the vertices had before, while vertex.index becomes the new slot (the row in G.adj). See G.vertex_id().
+        """
+        removed = len(self._removed_vertices)
+        if not removed:
+            return 0
+        slot_ids = self._slot_ids
+        ids = array("q")
+        vertices = {}
+        for slot, (index, vertex) in enumerate(sorted(self._vertices.items())):
+            ids.append(index if slot_ids is None else slot_ids[index])
+            vertex.index = slot
+            vertices[slot] = vertex
+        self._vertices = vertices
+        self._slot_ids = ids
+        self._id_map = {ids[slot]: vertex for slot, vertex in vertices.items()}
+        # The renumbering keeps the order of the vertices, so the edges' vertex tuples stay ordered
+        self._edge_index = {self._edge_key(*edges[0].vertices): edges for edges in self._edge_index.values()}
+        self._highest_vertex_index = len(vertices)
+        self._removed_vertices = set()
+        self._removed_edges = set()
+        self._union_find = None
+        self._version += 1
+        if self._storage == "dense":
+            self._distance_matrix = \
+                [[0 for _ in range(self._highest_vertex_index)] for _ in range(self._highest_vertex_index)]
+        self._adjacency_changed()
+        return removed
+
+    def bfs(self, source: int | Vertex, depth_limit: int = None):
+        """
+        Lazily traverses the graph breadth first and yields (vertex, parent, depth) for every reached vertex.\
+        See Utils.traversal.bfs.
+        """
+        return traversal.bfs(self, source, depth_limit)
+
+    def dfs(self, source: int | Vertex, depth_limit: int = None):
+        """
+        Lazily traverses the graph depth first and yields (vertex, parent, depth) for every reached vertex.\
+        See Utils.traversal.dfs.
+        """
+        return traversal.dfs(self, source, depth_limit)
+
+    def connected(self, v1: int | Vertex, v2: int | Vertex) -> bool:
+        """
+        Returns True if there is a path between the two vertices (ignoring the edge directions in directed graphs).
+        """
+        if isinstance(v1, int):
+            v1 = self.v(v1)
+        if isinstance(v2, int):
+            v2 = self.v(v2)
+        if v1 is None or v2 is None:
+            raise KeyError("The given index/vertex does not exist.")
+        return self._components_index().connected(v1.index, v2.index)
+
+    def components(self) -> list:
+        """
+        Returns the connected components as lists of vertices (ignoring the edge directions in directed graphs).
+        """
+        union_find = self._components_index()
+        components = {}
+        for index, vertex in self._vertices.items():
+            components.setdefault(union_find.find(index), []).append(vertex)
+        return list(components.values())
+
+    def save(self, path: str) -> None:
+        """
+        Saves the graph structure (vertex slots, compressed sparse row adjacency and weights) \
+        to a binary file that Graph.load() can map back. Vertex values are not saved, \
+        and neither are the IDs given by G.compact(): the file numbers the vertices by index.
+        """
+        binary_format.save(path, self._highest_vertex_index, self._removed_vertices, self._edge_count,
+                           self._csr_adjacency())
+
+    def read_edges(self, path: str, format: str = "edgelist", chunk_size: int = 65536, **options) -> int:
+        """
+        Streams the edges of a file into the graph and returns the number of added edges.\
+        format is one of "edgelist" (whitespace separated), "csv", "dimacs" and "mtx" (Matrix Market), \
+        the options are passed on to the reader in Utils.edge_formats. Gzip compressed files are recognized.\
+        The edges are added chunk_size at a time inside one batch, and vertices are created up to the \
+        highest index in the file (or the vertex count declared in its header).
+        """
+        assert format in edge_formats.READERS, f"The format must be one of {', '.join(edge_formats.READERS)}."
+        assert isinstance(chunk_size, int) and chunk_size > 0, "The chunk size must be a positive integer."
+        if format == "mtx":
+            options.setdefault("directed", self._directed)
+        added = 0
+        with self.batch():
+            declared = edge_formats.declared_vertex_count(path, format)
+            if declared is not None and declared > self._next_id:
+                self.add_vertices_from(declared - self._next_id)
+            chunk = []
+            for edge in edge_formats.READERS[format](path, **options):
+                chunk.append(edge)
+                if len(chunk) == chunk_size:
+                    added += self._add_edge_chunk(chunk)
+                    chunk = []
+            added += self._add_edge_chunk(chunk)
+        return added
+
+    def write_edges(self, path: str, format: str = "edgelist", **options) -> None:
+        """
+        Streams the edges of the graph to a file in the given format ("edgelist", "csv", "dimacs" or "mtx"), \
+        gzip compressed if the path ends with .gz. See Utils.edge_formats for the layouts.\
+        Edge lists and CSV files use the vertex IDs, DIMACS and Matrix Market files number the vertices \
+        1 to n in the order of their IDs, so the slots of removed vertices are not written.
+        """
+        assert format in edge_formats.WRITERS, f"The format must be one of {', '.join(edge_formats.WRITERS)}."
+        edge_formats.WRITERS[format](self, path, **options)
+
+    def to_scipy_sparse(self) -> object:
+        """
+        Returns the adjacency as a scipy.sparse.csr_array that shares the buffers of the graph's \
+        compressed sparse row index (read-only, rows and columns by vertex index). Requires SciPy.
+        """
+        return interop.to_scipy_sparse(self)
+
+    def to_numpy(self) -> object:
+        """
+        Returns the adjacency as a dense NumPy array of the summed edge weights, \
+        like G.adj without the -1 marks of removed vertices. Requires NumPy.
+        """
+        return interop.to_numpy(self)
+
+    def instrument(self, enabled: bool = True, callback=None) -> None:
+        """
+        Turns the collection of per-operation call counts and timings on or off. \
+        The callback, if given, is called with (operation, seconds) after every timed call.\
+        The instrumented graph runs a subclass with timed methods, a graph that is not instrumented \
+        runs the plain class and pays nothing. See Utils.instrumentation for the timed operations.
+        """
+        if enabled:
+            instrumentation.enable(self, callback)
+        else:
+            instrumentation.disable(self)
+
+    def stats(self, reset: bool = False) -> dict:
+        """
+        Returns a snapshot of the collected numbers: the calls, total, mean, maximum and percentile seconds \
+        by operation and the counts of matrix rebuilds, index rebuilds and single source searches.\
+        Drops the numbers after taking the snapshot if reset is True.
+        """
+        if self._instrumentation is None:
+            return {"operations": {}, "counters": {}}
+        snapshot = self._instrumentation.snapshot()
+        if reset:
+            self._instrumentation.reset()
+        return snapshot
+
+    @versioned
+    def freeze(self) -> FrozenGraph:
+        """
+        Returns an immutable FrozenGraph snapshot of the current structure that threads can read without locks \
+        while the graph keeps changing. The snapshot shares the compressed sparse row arrays \
+        and is created once per graph version.
+        """
+        present = bytearray(b"\x01") * self._highest_vertex_index
+        for index in self._removed_vertices:
+            present[index] = 0
+        return FrozenGraph(self._version, bytes(present), self._edge_count, self._csr_adjacency(), self._in_snapshot())
+
     def loop(self, vertex: int | Vertex) -> bool:
         """
         Returns True if the given vertex has at least one self-loop.
@@ -495,6 +855,8 @@ def deg(self, vertex: int | Vertex, count_self_loop: bool = True) -> int:
         """
         if isinstance(vertex, int):
             vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_adjacency().degree(vertex.index, count_self_loop)
         return vertex.deg(count_self_loop)
 
     def weight_deg(self, vertex: int | Vertex, count_self_loop: bool = True) -> int | tuple:
@@ -505,23 +867,183 @@ def weight_deg(self, vertex: int | Vertex, count_self_loop: bool = True) -> int
             vertex = self.v(vertex)
         return vertex.weight_deg(count_self_loop)
 
-    def d(self, origin: int | object, destination: int | object) -> int:
+    def d(self, origin: int | object, destination: int | object) -> int | float:
+        """
+        Returns the shortest distance between the origin and destination, the summed weight \
+        of the edges on the shortest path (the number of edges in unweighted graphs).\
+        Runs one bidirectional search between the two points, \
+        0 is returned if the destination is not reachable (like in the distance matrix).
+        """
+        distance, _ = self.shortest_path(origin, destination)
+        return 0 if distance is None else distance
+
+    def shortest_path(self, origin: int | Vertex, destination: int | Vertex) -> tuple:
+        """
+        Returns (distance, path) for the shortest weighted path from the origin to the destination, \
+        with the path as a list of vertices from the origin to the destination.\
+        Returns (None, []) if the destination is not reachable. The edge weights must not be negative.\
+        The search is a bidirectional Dijkstra search, guided by the landmarks (ALT) if the graph has \
+        a landmark index that guides searches (see G.build_landmarks()).
+        """
+        if isinstance(origin, int):
+            origin = self.v(origin)
+        if isinstance(destination, int):
+            destination = self.v(destination)
+        if origin is None or destination is None:
+            raise KeyError("The given origin/destination index/vertex does not exist.")
+        out_csr = self._csr_adjacency()
+        in_csr = self._csr_in_adjacency()
+        forward = (out_csr.offsets, out_csr.neighbors, out_csr.weights)
+        backward = (in_csr.offsets, in_csr.neighbors, in_csr.weights)
+        index = self._landmark_index()
+        if index is not None and index.guided:
+            distance, path = shortest_paths.bidirectional_a_star(
+                forward, backward, origin.index, destination.index,
+                index.heuristic(destination.index), index.reverse_heuristic(origin.index))
+        else:
+            distance, path = shortest_paths.bidirectional_dijkstra(forward, backward, origin.index, destination.index)
+        return distance, [self._vertices[index] for index in path]
+
+    def dijkstra(self, source: int | Vertex) -> dict:
         """
-        Returns the shortest distance between the origin and destination as an int.\
-        The distance is the number of edges between the two points.
+        Returns the shortest weighted distances from the source to every reachable vertex \
+        as a dictionary mapping the vertex to its distance. The edge weights must not be negative.
         """
-        if isinstance(origin, Vertex):
-            origin = origin.index
-        if isinstance(destination, Vertex):
-            destination = destination.index
-        return self.distance_matrix[origin][destination]
+        distances, _ = self._dijkstra(source)
+        return {self._vertices[index]: distance for index, distance in distances.items()}
+
+    def shortest_paths_from(self, source: int | Vertex) -> dict:
+        """
+        Returns the shortest weighted path from the source to every reachable vertex \
+        as a dictionary mapping the vertex to its path (a list of vertices starting with the source).
+        """
+        _, parents = self._dijkstra(source)
+        return {self._vertices[index]: [self._vertices[i] for i in shortest_paths.reconstruct_path(parents, index)]
+                for index in parents}
+
+    def build_landmarks(self, count: int = 16, strategy: str = "farthest", seed: int = None, workers: int = 1,
+                        refresh: bool = True, guided: bool = None,
+                        refresh_after: int = 64) -> landmarks.LandmarkIndex:
+        """
+        Builds a landmark index and returns it: the shortest distances between count landmark vertices and \
+        every vertex, one array per landmark. G.d_bounds() then bounds any distance in O(count), and if guided \
+        G.d() / G.shortest_path() run bidirectional A* searches with landmark bounds (ALT) instead of Dijkstra.\
+        guided=None decides from the graph: the guidance pays off on graphs with long shortest paths \
+        (see Utils.landmarks.build()).\
+        strategy picks the landmarks: "farthest" (every next one farthest from the ones picked so far), \
+        "degree" (the highest degrees) or "random" (seeded). Their searches run in workers processes, \
+        except for "farthest" where every pick depends on the previous search.\
+        The index belongs to one graph version. If refresh is False, the first mutation drops it. \
+        Otherwise a rebuild (count searches, keeping the landmarks that still exist) is deferred until \
+        refresh_after mutations have accumulated: until then G.d() / G.shortest_path() run unguided \
+        bidirectional Dijkstra searches, and only G.d_bounds() rebuilds the index right away.
+        """
+        assert isinstance(count, int) and count >= 1, "The landmark count must be a positive integer."
+        assert strategy in landmarks.STRATEGIES, f"The strategy must be one of {', '.join(landmarks.STRATEGIES)}."
+        assert isinstance(workers, int) and workers >= 1, "The number of workers must be a positive integer."
+        assert isinstance(refresh_after, int) and refresh_after >= 1, \
+            "The number of mutations before a refresh must be a positive integer."
+        self._landmark_options = {"count": count, "strategy": strategy, "seed": seed, "workers": workers,
+                                  "refresh": refresh, "refresh_after": refresh_after, "guided": guided,
+                                  "vertices": []}
+        self._landmarks = None
+        return self._landmark_index()
+
+    def d_bounds(self, origin: int | Vertex, destination: int | Vertex) -> tuple:
+        """
+        Returns (lower, upper) bounds of the weighted shortest distance from the landmark index \
+        in O(landmarks), (inf, inf) if the destination is provably unreachable. See G.build_landmarks().\
+        An index that is out of date is rebuilt first, mutations can invalidate both bounds.
+        """
+        if isinstance(origin, int):
+            origin = self.v(origin)
+        if isinstance(destination, int):
+            destination = self.v(destination)
+        if origin is None or destination is None:
+            raise KeyError("The given origin/destination index/vertex does not exist.")
+        index = self._landmark_index(rebuild=True)
+        if index is None:
+            raise ValueError("The graph has no landmark index, see G.build_landmarks().")
+        return index.bounds(origin.index, destination.index)
+
+    def pagerank(self, alpha: float = 0.85, weighted: bool = True, tolerance: float = 1e-6,
+                 max_iterations: int = 100, start: dict = None, reverse: bool = False) -> dict:
+        """
+        Returns the PageRank of every vertex as a dictionary mapping the vertex to its score (the scores sum to 1).\
+        A random walk follows an edge (chosen by weight if weighted) with probability alpha \
+        and jumps to a random vertex otherwise. Directed graphs follow the out-edges, or the in-edges if reverse.\
+        start is a previous result to warm start from, e.g. after a few edges have changed \
+        (vertices that were removed since are skipped). Power iteration over the compressed sparse row \
+        adjacency, vectorized with NumPy if it is installed (see Utils.centrality).\
+        Raises a ValueError for negative weights or if the scores do not converge within max_iterations.
+        """
+        assert 0 <= alpha < 1, "alpha must be in [0, 1)."
+        csr = self._csr_in_adjacency() if reverse else self._csr_adjacency()
+        scores = centrality.pagerank(csr.offsets, csr.neighbors, csr.weights, list(self._vertices), alpha, weighted,
+                                     tolerance, max_iterations, self._slot_scores(start, csr), not self._directed)
+        return {vertex: scores[index] for index, vertex in self._vertices.items()}
+
+    def eigenvector_centrality(self, weighted: bool = True, tolerance: float = 1e-6, max_iterations: int = 100,
+                               start: dict = None, reverse: bool = False) -> dict:
+        """
+        Returns the eigenvector centrality of every vertex as a dictionary mapping the vertex to its score, \
+        the principal eigenvector of the adjacency normalized to a Euclidean length of 1.\
+        A vertex scores the (weighted) sum of the scores of its neighbors, in directed graphs of the vertices \
+        with edges entering it, or of the ones its edges enter if reverse.\
+        start warm starts like in G.pagerank(). \
+        Raises a ValueError if the scores do not converge within max_iterations.
+        """
+        csr = self._csr_in_adjacency() if reverse else self._csr_adjacency()
+        scores = centrality.eigenvector_centrality(csr.offsets, csr.neighbors, csr.weights, list(self._vertices),
+                                                   weighted, tolerance, max_iterations,
+                                                   self._slot_scores(start, csr), not self._directed)
+        return {vertex: scores[index] for index, vertex in self._vertices.items()}
+
+    def betweenness_centrality(self, normalized: bool = True, weighted: bool = True, samples: int = None,
+                               seed: int = None, workers: int = 1) -> dict:
+        """
+        Returns the betweenness centrality of every vertex as a dictionary mapping the vertex to its score: \
+        the share of the shortest paths between every pair of other vertices that pass through it \
+        (summed, divided by the number of pairs if normalized). Brandes' algorithm, one search per source \
+        over the compressed sparse row adjacency, breadth first unless weighted and an edge weight is not 1.\
+        samples=k searches from k random sources (seeded) and scales the result, an estimate for large graphs.\
+        The sources are split between workers processes that share the adjacency.\
+        Raises a ValueError for negative weights.
+        """
+        assert samples is None or (isinstance(samples, int) and samples >= 1), \
+            "The number of samples must be a positive integer."
+        assert isinstance(workers, int) and workers >= 1, "The number of workers must be a positive integer."
+        csr = self._csr_adjacency()
+        scores = centrality.betweenness(csr.offsets, csr.neighbors, csr.weights, list(self._vertices), self._directed,
+                                        not weighted or self._non_unit_weight_count == 0, normalized, samples, seed,
+                                        workers)
+        return {vertex: scores[index] for index, vertex in self._vertices.items()}
+
+    def degree_centrality(self, direction: str = "all") -> dict:
+        """
+        Returns the degree centrality of every vertex as a dictionary mapping the vertex to its degree \
+        divided by the number of other vertices. direction picks the "in", "out" or "all" (both) degree \
+        in directed graphs and is ignored in undirected ones.
+        """
+        assert direction in ("all", "in", "out"), "The direction must be one of all, in, out."
+        scale = 1 / (self._vertex_count - 1) if self._vertex_count > 1 else 1
+        out_csr = self._csr_adjacency()
+        in_csr = self._csr_in_adjacency()
+        if not self._directed or direction == "out":
+            return {vertex: out_csr.degree(index) * scale for index, vertex in self._vertices.items()}
+        if direction == "in":
+            return {vertex: in_csr.degree(index) * scale for index, vertex in self._vertices.items()}
+        return {vertex: (out_csr.degree(index) + in_csr.degree(index)) * scale
+                for index, vertex in self._vertices.items()}
 
     def incident_on(self, vertex: int | Vertex) -> list:
         """
         Returns every edge connected to the vertex.
         """
         if isinstance(vertex, int):
-            return self.v(vertex).edges
+            vertex = self.v(vertex)
+        if self._storage == "csr" and self._csr_is_current():
+            return self._csr_adjacency().row_edges(vertex.index)
         return vertex.edges
 
     def eccentricity(self, vertex: int | object) -> int:
@@ -530,61 +1052,461 @@ def eccentricity(self, vertex: int | object) -> int:
         """
         if isinstance(vertex, int):
             vertex = self.v(vertex)
+        return self._eccentricity(vertex)
+
+    def diameter_bounds(self, sweeps: int = 2) -> tuple:
+        """
+        Returns a (lower, upper) bound of the diameter from the given number of double sweeps per component, \
+        two breadth first searches each, for graphs too large for the exact diameter property.\
+        Every search from a vertex v gives e(v) <= diameter <= 2 e(v), so the bounds are exact when equal.\
+        Directed graphs return the exact diameter as both bounds.
+        """
+        if self._directed:
+            return self.diameter, self.diameter
+        return self._sweep_bounds(sweeps)[0]
+
+    def radius_bounds(self, sweeps: int = 2) -> tuple:
+        """
+        Returns a (lower, upper) bound of the radius from the given number of double sweeps per component \
+        (see diameter_bounds()). The radius is at most the smallest eccentricity found and at least half \
+        of the diameter's lower bound.\
+        Directed graphs return the exact radius as both bounds.
+        """
+        if self._directed:
+            return self.radius, self.radius
+        return self._sweep_bounds(sweeps)[1]
+
+    @versioned
+    def _sweep_bounds(self, sweeps: int) -> tuple:
+        """
+        Returns the diameter and radius bounds of an undirected graph. Computed once per graph version.
+        """
+        assert isinstance(sweeps, int) and sweeps >= 1, "The number of sweeps must be a positive integer."
+        csr = self._csr_adjacency()
+        return distance_bounds.bounds(csr.offsets, csr.neighbors, self._component_indices(), sweeps)
+
+    @versioned
+    def _eccentricity(self, vertex: Vertex) -> int:
+        """
+        Returns the eccentricity of the vertex. Computed once per graph version.
+        """
         return max(self._simple_bfs(vertex))
 
+    @versioned
+    def _eccentricities(self) -> list:
+        """
+        Returns the eccentricities of all vertices in the order of self._vertices. \
+        Computed once per graph version and shared by the radius, diameter and central properties.
+        """
+        csr = self._csr_adjacency()
+        return bitset_bfs.eccentricities(csr.offsets, csr.neighbors, list(self._vertices))
+
+    @versioned
+    def _radius_and_center(self) -> tuple:
+        """
+        Returns the radius and the sorted indices of the central vertices of an undirected graph. \
+        Computed once per graph version and shared by the radius and central properties.
+        """
+        csr = self._csr_adjacency()
+        return distance_bounds.radius_and_center(csr.offsets, csr.neighbors, self._component_indices())
+
+    @versioned
+    def _component_indices(self) -> list:
+        """
+        Returns the connected components as lists of vertex indices. Computed once per graph version.
+        """
+        union_find = self._components_index()
+        components = {}
+        for index in self._vertices:
+            components.setdefault(union_find.find(index), []).append(index)
+        return list(components.values())
+
     def _simple_bfs(self, vertex: Vertex) -> list:
         """
-        Returns a list of the distances from the given vertex to all other vertices.
+        Returns a list of the distances from the given vertex to all other vertices.\
+        The visit state lives in the traversal, so concurrent searches on the graph do not interfere.
         """
-        from Utils.BFS_state import BFSState
         distance = [0 for _ in range(self._highest_vertex_index)]
-        if vertex not in self._removed_vertices:
-            queue = []
-            vertex._BFS_state = BFSState.SEEN
-            if not vertex.is_isolated:
-                queue.append(vertex)
-                while len(queue) > 0:
-                    current = queue.pop(0)
-                    for edge in current.edges:
-                        if edge.connected_to[0] == current:
-                            other_vertex = edge.connected_to[1]
-                        else:
-                            other_vertex = edge.connected_to[0]
-                        if other_vertex._BFS_state == BFSState.UNSEEN:
-                            other_vertex._BFS_state = BFSState.SEEN
-                            distance[other_vertex.index] = distance[current.index] + 1
-                            queue.append(other_vertex)
-                    current._BFS_state = BFSState.VISITED
-            for v in self._vertices:
-                v._BFS_state = BFSState.UNSEEN
+        if vertex.index not in self._removed_vertices:
+            csr = self._csr_adjacency()
+            for index, _, depth in traversal.bfs_indices(csr.offsets, csr.neighbors, vertex.index):
+                distance[index] = depth
         return distance
 
+    def _slot_scores(self, scores: dict | None, csr: CSRAdjacency) -> list | None:
+        """
+        Returns the scores by vertex (a previous centrality result) as a list by vertex index \
+        with a row for every index of the adjacency, 0 for missing vertices. None stays None.
+        """
+        if scores is None:
+            return None
+        slots = [0.0] * (len(csr.offsets) - 1)
+        for vertex, score in scores.items():
+            if self._vertices.get(vertex.index) is vertex:
+                slots[vertex.index] = score
+        return slots
+
+    def _dijkstra(self, source: int | Vertex) -> tuple:
+        """
+        Runs Dijkstra's algorithm from the source over the compressed sparse row adjacency \
+        and returns the (distances, parents) dictionaries by vertex index.
+        """
+        if isinstance(source, int):
+            source = self.v(source)
+        if source is None:
+            raise KeyError("The given source index/vertex does not exist.")
+        csr = self._csr_adjacency()
+        return shortest_paths.dijkstra(csr.offsets, csr.neighbors, csr.weights, source.index)
+
+    def _add_edge_chunk(self, chunk: list) -> int:
+        """
+        Adds the (v1, v2, weight) index tuples, creating the vertices up to the highest index first. \
+        Returns the number of added edges.
+        """
+        if not chunk:
+            return 0
+        highest = max(max(v1, v2) for v1, v2, _ in chunk)
+        if highest >= self._next_id:
+            self.add_vertices_from(highest + 1 - self._next_id)
+        return len(self.add_edges_from(chunk))
+
+    def _assign_ids(self, vertices) -> None:
+        """
+        Hands out the next IDs to the new vertices. \
+        They are only recorded once self.compact() has decoupled the IDs from the indices.
+        """
+        if self._id_map is not None:
+            for vertex in vertices:
+                self._slot_ids.append(self._next_id)
+                self._id_map[self._next_id] = vertex
+                self._next_id += 1
+        else:
+            self._next_id += len(vertices)
+
+    def _compact_if_due(self) -> None:
+        """
+        Compacts the graph if the share of removed vertex slots has reached the compaction threshold. \
+        Inside of self.batch() the check is deferred until the batch exits.
+        """
+        threshold = self._compaction_threshold
+        if threshold is not None and not self._batch_depth and self._removed_vertices \
+                and self.tombstone_ratio >= threshold:
+            self.compact()
+
+    def _landmark_index(self, rebuild: bool = False) -> landmarks.LandmarkIndex | None:
+        """
+        Returns the landmark index of the current version, None if the graph has no landmark index. \
+        After a mutation, an index that is not refreshed is dropped. A refreshed one is rebuilt once \
+        refresh_after mutations have accumulated (or right away if rebuild is True), until then None is returned.
+        """
+        index = self._landmarks
+        if index is not None and index.version == self._version:
+            return index
+        options = self._landmark_options
+        if options is None:
+            return None
+        if index is not None and not options["refresh"]:
+            self._landmarks = self._landmark_options = None
+            return None
+        # The version grows by one per mutation
+        if index is not None and not rebuild and self._version - index.version < options["refresh_after"]:
+            return None
+        # The landmarks are kept as vertices, their indices change with self.compact()
+        kept = [vertex.index for vertex in options["vertices"] if self._vertices.get(vertex.index) is vertex]
+        index = landmarks.build(self._version, self._csr_adjacency(), self._in_snapshot(), list(self._vertices),
+                                options["count"], options["strategy"], options["seed"], kept,
+                                self._non_unit_weight_count == 0, options["workers"], options["guided"])
+        options["vertices"] = [self._vertices[i] for i in index.landmarks]
+        self._landmarks = index
+        return index
+
+    def _components_index(self) -> UnionFind:
+        """
+        Returns the disjoint-set index of the connected components. Rebuilds it first after an edge removal.
+        """
+        union_find = self._union_find
+        if union_find is None:
+            union_find = UnionFind(self._highest_vertex_index)
+            for edge in self._edges:
+                union_find.union(edge.vertices[0].index, edge.vertices[1].index)
+            self._union_find = union_find
+        return union_find
+
+    def _edge_disconnected(self, edge: Edge) -> None:
+        """
+        Drops the component index after the edge has been removed unless its vertices are still adjacent, \
+        in which case the components stay the same.
+        """
+        v1, v2 = edge.vertices
+        if v1 is not v2 and not v1.is_adjacent_to(v2):
+            self._union_find = None
+
+    def _csr_adjacency(self) -> CSRAdjacency:
+        """
+        Returns the compressed sparse row adjacency. Builds it first if the graph has changed.
+        """
+        csr = self._csr
+        if csr is None or self._csr_version != self._version:
+            version = self._version
+            csr = CSRAdjacency.from_entries(self._highest_vertex_index, self._csr_entries())
+            self._csr, self._csr_version = csr, version
+        return csr
+
+    def _csr_is_current(self) -> bool:
+        """
+        Whether the compressed sparse row adjacency is built for the current version.\
+        The single vertex reads of the csr storage (degrees, incident edges) only use it then and read \
+        the vertex's edge lists otherwise, so mutations interleaved with reads do not rebuild it every time. \
+        The whole graph kernels rebuild it lazily.
+        """
+        return self._csr is not None and self._csr_version == self._version
+
+    def _csr_in_adjacency(self) -> CSRAdjacency:
+        """
+        Returns the compressed sparse row adjacency of the incoming edges, \
+        which is the same as the adjacency in undirected graphs.
+        """
+        return self._csr_adjacency()
+
+    def _in_snapshot(self) -> CSRAdjacency | None:
+        """
+        Returns the incoming adjacency for snapshots, None as undirected graphs have no separate one.
+        """
+        return None
+
+    def _csr_entries(self):
+        """
+        Yields the (row, neighbor, weight, edge) entries of the adjacency in edge insertion order.\
+        A self-loop gets two entries in its row, the same way it is listed twice in vertex.edges.
+        """
+        for edge in self._edges:
+            i1 = edge.vertices[0].index
+            i2 = edge.vertices[1].index
+            yield i1, i2, edge.weight, edge
+            yield i2, i1, edge.weight, edge
+
+    def _grow_matrices(self, count: int) -> None:
+        """
+        Adds count rows and columns of zeros to the dense matrices for new vertices.\
+        The removed vertices keep their -1 entries in the new columns of the adjacency matrix.
+        """
+        for matrix in (self._simple_adjacency_matrix, self._distance_matrix):
+            for row in matrix:
+                row.extend([0] * count)
+            for _ in range(count):
+                matrix.append([0] * self._highest_vertex_index)
+        for index in self._removed_vertices:
+            self._simple_adjacency_matrix[index][-count:] = [-1] * count
+            for row in self._simple_adjacency_matrix[-count:]:
+                row[index] = -1
+
+    def _add_edge(self, v1: int | object, v2: int | object, weight: int = 1) -> object:
+        """
+        Validates the arguments, creates the edge and adds it to the edge set \
+        without updating the adjacency representations.
+        """
+        assert isinstance(v1, int) or isinstance(v1, Vertex), \
+            "The vertex arguments must either be vertex indices or vertex objects."
+        assert isinstance(v2, int) or isinstance(v2, Vertex), \
+            "The vertex arguments must either be vertex indices or vertex objects."
+        if isinstance(v1, int):
+            v1 = self.v(v1)
+        if isinstance(v2, int):
+            v2 = self.v(v2)
+        if v1 is None:
+            raise KeyError("The given v1 index/vertex does not exist.")
+        if v2 is None:
+            raise KeyError("The given v2 index/vertex does not exist.")
+        new_edge = self._new_edge(v1, v2, weight)
+        self._edges[new_edge] = None
+        parallel_edges = self._edge_index.setdefault(self._edge_key(v1, v2), [])
+        parallel_edges.append(new_edge)
+        if len(parallel_edges) > 1:
+            self._parallel_edge_count += 1
+        self._edge_count += 1
+        self._version += 1
+        self._count_edge(new_edge, 1)
+        if self._union_find is not None:
+            self._union_find.union(v1.index, v2.index)
+        return new_edge
+
+    def _count_edge(self, edge: Edge, step: int) -> None:
+        """
+        Updates the structural counters after the edge has been added (step 1) or removed (step -1). \
+        The vertices' edge lists must already reflect the change.
+        """
+        if edge.weight != 1:
+            self._non_unit_weight_count += step
+        if edge.is_self_loop:
+            self._self_loop_count += step
+        for vertex in set(edge.vertices):
+            self._classify_degree(vertex)
+
+    def _classify_degree(self, vertex: Vertex) -> None:
+        """
+        Files the vertex under the isolated or pendent vertices according to its degree without self-loops.
+        """
+        deg = vertex.deg(count_self_loop=False)
+        if deg == 0:
+            self._isolated[vertex] = None
+        else:
+            self._isolated.pop(vertex, None)
+        if deg == 1:
+            self._pendent[vertex] = None
+        else:
+            self._pendent.pop(vertex, None)
+
+    def _edge_key(self, v1: Vertex, v2: Vertex) -> tuple:
+        """
+        Returns the key of the edges between the two vertices in self._edge_index. \
+        The key does not depend on the order of the vertices in an undirected graph.
+        """
+        if v1.index <= v2.index:
+            return v1.index, v2.index
+        return v2.index, v1.index
+
+    def _unindex_edge(self, edge: Edge) -> None:
+        """
+        Removes the edge from self._edge_index.
+        """
+        key = self._edge_key(edge.vertices[0], edge.vertices[1])
+        parallel_edges = self._edge_index[key]
+        parallel_edges.remove(edge)
+        if parallel_edges:
+            self._parallel_edge_count -= 1
+        else:
+            del self._edge_index[key]
+
+    def _new_edge(self, v1: Vertex, v2: Vertex, weight: int) -> Edge:
+        """
+        Creates the edge object of the graph's kind.
+        """
+        return Edge(vertices=(v1, v2), weight=weight)
+
+    def _edge_added(self, edge: Edge) -> None:
+        """
+        Brings the adjacency representations up to date after a single edge has been added.\
+        The dense storage only touches the matrix cells of the new edge.
+        """
+        if self._storage == "csr" or self._batch_depth:
+            self._adjacency_changed()
+            return
+        i1 = edge.vertices[0].index
+        i2 = edge.vertices[1].index
+        if i1 != i2:
+            self._grow_adj_cell(i1, i2, edge.weight)
+        self._grow_adj_cell(i2, i1, edge.weight)
+
+    def _grow_adj_cell(self, row: int, column: int, weight: int) -> None:
+        """
+        Adds the weight to a cell of the simple adjacency matrix and keeps self._highest_weight_len up to date.
+        """
+        self._simple_adjacency_matrix[row][column] += weight
+        length = len(str(self._simple_adjacency_matrix[row][column]))
+        if length > self._highest_weight_len:
+            self._highest_weight_len = length
+
+    def _adjacency_changed(self) -> None:
+        """
+        Brings the adjacency representations up to date after an edge has been added or removed.\
+        The dense storage rebuilds its matrix right away while the csr storage drops its index \
+        to be rebuilt on the next query. Inside of self.batch() the dense update is deferred until the batch exits.
+        """
+        if self._storage == "csr":
+            self._csr = None
+        elif self._batch_depth:
+            self._batch_pending = True
+        else:
+            self._update_adj()
+            self._reset_highest_weight_len()
+
     def _update_adj(self) -> None:
         """
         Updates self._simple_adjacency_matrix with the new edge value.
         """
         self._simple_adjacency_matrix: list = [
-            [0 for _ in range(self._vertex_count)] for _ in range(self._vertex_count)]
+            [0 for _ in range(self._highest_vertex_index)] for _ in range(self._highest_vertex_index)]
         for edge in self._edges:
             i1 = edge.vertices[0].index
             i2 = edge.vertices[1].index
             if i1 != i2:
                 self._simple_adjacency_matrix[i1][i2] += edge.weight
             self._simple_adjacency_matrix[i2][i1] += edge.weight
+        self._mark_removed_vertices()
+
+    def _mark_removed_vertices(self) -> None:
+        """
+        Fills the rows and columns of the removed vertices in self._simple_adjacency_matrix with -1.
+        """
+        for index in self._removed_vertices:
+            self._simple_adjacency_matrix[index] = [-1 for _ in range(self._highest_vertex_index)]
+            for row in self._simple_adjacency_matrix:
+                row[index] = -1
 
     def _reset_highest_weight_len(self) -> None:
         """
-        Resets the highest weight length for the string representation of the adjacency matrix.
+        Resets the highest weight length for the string representation of the adjacency matrix.\
+        Only the cells of existing edges can hold values other than 0, so only those are checked.
         """
-        self._highest_weight_len = 1
-        for row in self._simple_adjacency_matrix:
-            for element in row:
-                length = len(str(element))
-                if length > self._highest_weight_len:
-                    self._highest_weight_len = length
+        self._highest_weight_len = 2 if self._removed_vertices else 1
+        for edge in self._edges:
+            length = len(str(self._simple_adjacency_matrix[edge.vertices[0].index][edge.vertices[1].index]))
+            if length > self._highest_weight_len:
+                self._highest_weight_len = length
 
     # Class / static methods
 
+    @classmethod
+    def from_scipy_sparse(cls, matrix: object, storage: str = "dense") -> "Graph":
+        """
+        Creates a graph with a vertex per row and an edge per non-zero entry of the square sparse matrix \
+        (the entry being the weight). Undirected graphs read the upper triangle of a symmetric matrix. Requires SciPy.
+        """
+        return cls._from_matrix_edges(*interop.sparse_edges(matrix, cls._directed), storage)
+
+    @classmethod
+    def from_numpy(cls, matrix: object, storage: str = "dense") -> "Graph":
+        """
+        Creates a graph with a vertex per row and an edge per non-zero entry of the square array \
+        (the entry being the weight). Undirected graphs read the upper triangle of a symmetric matrix. Requires NumPy.
+        """
+        return cls._from_matrix_edges(*interop.dense_edges(matrix, cls._directed), storage)
+
+    @classmethod
+    def _from_matrix_edges(cls, vertex_count: int, edges, storage: str) -> "Graph":
+        """
+        Creates a graph with vertex_count vertices and the given (v1, v2, weight) edges.
+        """
+        graph = cls(storage=storage)
+        with graph.batch():
+            graph.add_vertices_from(vertex_count)
+            graph.add_edges_from(edges)
+        return graph
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, storage: str = "dense") -> "Graph | binary_format.MappedGraph":
+        """
+        Loads a graph saved by save().\
+        With mmap=True, returns a read-only binary_format.MappedGraph that answers degree and neighbor queries \
+        straight from the memory mapped file without creating vertex or edge objects. \
+        With mmap=False, rebuilds a full graph with the saved vertex indices (removed ones stay removed).
+        """
+        mapped = binary_format.MappedGraph(path)
+        if mapped.directed != cls._directed:
+            mapped.close()
+            raise ValueError(f"The file holds {'a directed' if mapped.directed else 'an undirected'} graph.")
+        if mmap:
+            return mapped
+        with mapped:
+            graph = cls(storage=storage)
+            with graph.batch():
+                graph.add_vertices_from(mapped.slots)
+                for index in range(mapped.slots):
+                    if not mapped.has_vertex(index):
+                        graph.remove_vertex(index)
+                graph.add_edges_from(mapped.edges())
+        return graph
+
     @staticmethod
     def vertex_set_check(a: set | list) -> bool:
         """
@@ -1,11 +1,12 @@
-from Utils.BFS_state import BFSState
-
-
 class Vertex:
     """
     Represents a vertex in a graph.
     """
 
+    # Vertices are stored in the millions, so they have no instance dict
+    __slots__ = ("_index", "_value", "_edges_a", "_in_edges_a", "_out_edges_a", "_adjacency_count",
+                 "_loop_count", "_loop", "_directional_graph")
+
     # Dunder methods
 
     def __init__(self, index: int, value: object = None, directional_graph: bool = False) -> None:
@@ -16,11 +17,16 @@ def __init__(self, index: int, value: object = None, directional_graph: bool = F
         self._index: int = index
         self._value: object = value
         self._edges_a: list = []
-        self._in_edges_a: list = []
-        self._out_edges_a: list = []
+        # The direction specific edge lists, only allocated for the vertices of directed graphs
+        self._in_edges_a: list | None = None
+        self._out_edges_a: list | None = None
+        # The number of edges to each adjacent vertex, for constant time adjacency checks.
+        # Only allocated while the vertex has edges
+        self._adjacency_count: dict | None = None
+        # The number of self-loop entries in self._edges_a (every self-loop is listed twice)
+        self._loop_count: int = 0
         self._loop: bool = False
         self._directional_graph: bool = directional_graph
-        self._BFS_state: BFSState = BFSState.UNSEEN
 
     def __str__(self) -> str:
         return f"{self._index}"
@@ -28,22 +34,13 @@ def __str__(self) -> str:
     def __repr__(self) -> str:
         return self.__str__()
 
-    def __del__(self) -> None:
-        self._index = None
-        del self._value
-        self._value = None
-
     def __lt__(self, other: object) -> bool:  # <
         return self._index < other.index
 
     def __le__(self, other: object) -> bool:  # <=
         return self._index <= other.index
 
-    def __eq__(self, other: object) -> bool:  # ==
-        return self is other
-
-    def __ne__(self, other: object) -> bool:  # !=
-        return self is not other
+    # Equality and hashing are by identity, the object defaults are used for speed
 
     def __gt__(self, other: object) -> bool:  # >
         return self._index > other.index
@@ -98,26 +95,23 @@ def edges(self) -> list:
     @property
     def in_edges(self) -> list:
         """
-        Returns a list of all edges that are connected to the vertex.
+        Returns a list of the edges that enter the vertex.
         """
-        return self._in_edges_a
+        return self._in_edges_a if self._in_edges_a is not None else []
 
     @property
     def out_edges(self) -> list:
         """
-        Returns a list of all edges that are connected to the vertex.
+        Returns a list of the edges that leave the vertex.
         """
-        return self._out_edges_a
+        return self._out_edges_a if self._out_edges_a is not None else []
 
     @property
     def loop(self) -> bool:
         """
         Returns True if the vertex has a self-loop edge.
         """
-        self._loop = False
-        for edge in self._edges_a:
-            if edge.is_self_loop:
-                self._loop = True
+        self._loop = self._loop_count > 0
         return self._loop
 
     @property
@@ -156,19 +150,56 @@ def add_edge(self, edge: object) -> None:
         Connects the vertex to the given edge.
         """
         self._edges_a.append(edge)
+        other = edge.connected_to[1] if edge.connected_to[0] is self else edge.connected_to[0]
+        if self._adjacency_count is None:
+            self._adjacency_count = {}
+        self._adjacency_count[other] = self._adjacency_count.get(other, 0) + 1
+        if other is self:
+            self._loop_count += 1
+
+    def remove_edge(self, edge: object) -> None:
+        """
+        Disconnects the vertex from the given edge.
+        """
+        self._edges_a.remove(edge)
+        other = edge.connected_to[1] if edge.connected_to[0] is self else edge.connected_to[0]
+        if self._adjacency_count[other] == 1:
+            del self._adjacency_count[other]
+            if not self._adjacency_count:
+                self._adjacency_count = None
+        else:
+            self._adjacency_count[other] -= 1
+        if other is self:
+            self._loop_count -= 1
 
     def add_in_edge(self, edge: object) -> None:
         """
         Adds incoming edge.
         """
+        if self._in_edges_a is None:
+            self._in_edges_a = []
         self._in_edges_a.append(edge)
 
     def add_out_edge(self, edge: object) -> None:
         """
         Adds outgoing edge.
         """
+        if self._out_edges_a is None:
+            self._out_edges_a = []
         self._out_edges_a.append(edge)
 
+    def remove_in_edge(self, edge: object) -> None:
+        """
+        Removes incoming edge.
+        """
+        self._in_edges_a.remove(edge)
+
+    def remove_out_edge(self, edge: object) -> None:
+        """
+        Removes outgoing edge.
+        """
+        self._out_edges_a.remove(edge)
+
     def deg(self, count_self_loop: bool = True) -> tuple | int:
         """
         Returns the degree of the vertex.
@@ -177,15 +208,15 @@ def deg(self, count_self_loop: bool = True) -> tuple | int:
         """
         if self._directional_graph:
             if count_self_loop:
-                deg = tuple([len(self._in_edges_a), len(self._out_edges_a)])
+                deg = tuple([len(self.in_edges), len(self.out_edges)])
             else:
-                deg = tuple([sum([1 if not edge.is_self_loop else 0 for edge in self._in_edges_a]),
-                             sum([1 if not edge.is_self_loop else 0 for edge in self._out_edges_a])])
+                deg = tuple([sum([1 if not edge.is_self_loop else 0 for edge in self.in_edges]),
+                             sum([1 if not edge.is_self_loop else 0 for edge in self.out_edges])])
         else:
             if count_self_loop:
                 deg = len(self._edges_a)
             else:
-                deg = sum([1 if not edge.is_self_loop else 0 for edge in self._edges_a])
+                deg = len(self._edges_a) - self._loop_count
         return deg
 
     def weight_deg(self, count_self_loop: bool = True) -> tuple:
@@ -194,11 +225,11 @@ def weight_deg(self, count_self_loop: bool = True) -> tuple:
         """
         if self._directional_graph:
             if count_self_loop:
-                deg = tuple([sum([i.weight for i in self._in_edges_a]),
-                             sum([i.weight for i in self._out_edges_a])])
+                deg = tuple([sum([i.weight for i in self.in_edges]),
+                             sum([i.weight for i in self.out_edges])])
             else:
-                deg = tuple([sum([i.weight for i in self._in_edges_a if not i.is_self_loop]),
-                             sum([i.weight for i in self._out_edges_a if not i.is_self_loop])])
+                deg = tuple([sum([i.weight for i in self.in_edges if not i.is_self_loop]),
+                             sum([i.weight for i in self.out_edges if not i.is_self_loop])])
         else:
             if count_self_loop:
                 deg = tuple([sum([i.weight for i in self._edges_a])])
@@ -210,9 +241,4 @@ def is_adjacent_to(self, vertex: object) -> bool:
         """
         Whether the given vertex is adjacent to self.
         """
-        check = False
-        for edge in self._edges_a:
-            if edge.is_connected_to(vertex):
-                check = True
-                break
-        return check
+        return self._adjacency_count is not None and vertex in self._adjacency_count